@@ -19,7 +19,8 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 def get_url():
-    return settings.DATABASE_URL
+    # DDL (CREATE INDEX CONCURRENTLY, SET maintenance_work_mem) needs a real session, not PgBouncer
+    return settings.MIGRATIONS_DATABASE_URL or settings.DATABASE_URL
 
 def run_migrations_offline() -> None:
     url = get_url()
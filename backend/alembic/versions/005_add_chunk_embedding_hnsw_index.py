@@ -0,0 +1,43 @@
+"""add tuned hnsw index on transcription_chunks.embedding
+
+Revision ID: 005_chunk_embedding_hnsw
+Revises: 004_add_source_type
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005_chunk_embedding_hnsw'
+down_revision = '004_add_source_type'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Give the build enough memory to keep the graph in RAM and use parallel workers
+        op.execute("SET maintenance_work_mem = '2GB'")
+        op.execute("SET max_parallel_maintenance_workers = 7")
+
+        # Replace the default (m=16, ef_construction=64) index from the initial schema
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding")
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_embedding_hnsw
+            ON transcription_chunks
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 24, ef_construction = 128)
+        """)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_hnsw")
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_embedding
+            ON transcription_chunks
+            USING hnsw (embedding vector_cosine_ops)
+            WITH (m = 16, ef_construction = 64)
+        """)
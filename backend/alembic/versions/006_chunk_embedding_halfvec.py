@@ -0,0 +1,53 @@
+"""store transcription_chunks.embedding as halfvec
+
+Revision ID: 006_chunk_embedding_halfvec
+Revises: 005_chunk_embedding_hnsw
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '006_chunk_embedding_halfvec'
+down_revision = '005_chunk_embedding_hnsw'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The index is tied to the column type, drop it before converting
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+
+    # FP16 halves index size and memory traffic per ANN probe
+    op.execute("""
+        ALTER TABLE transcription_chunks
+        ALTER COLUMN embedding TYPE halfvec(384)
+        USING embedding::halfvec(384)
+    """)
+
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute("SET max_parallel_maintenance_workers = 7")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+        ON transcription_chunks
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+
+    op.execute("""
+        ALTER TABLE transcription_chunks
+        ALTER COLUMN embedding TYPE vector(384)
+        USING embedding::vector(384)
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+        ON transcription_chunks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
@@ -0,0 +1,35 @@
+"""add keyset pagination indexes for meetings and knowledge_queries
+
+Revision ID: 007_keyset_pagination_indexes
+Revises: 006_chunk_embedding_halfvec
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_keyset_pagination_indexes'
+down_revision = '006_chunk_embedding_halfvec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Match the (sort key, id) cursor ordering so each page is a single index range scan
+    op.create_index(
+        'ix_meetings_user_start_time_id',
+        'meetings',
+        ['user_id', sa.text('start_time DESC'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_knowledge_queries_user_created_at_id',
+        'knowledge_queries',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_knowledge_queries_user_created_at_id', 'knowledge_queries')
+    op.drop_index('ix_meetings_user_start_time_id', 'meetings')
@@ -0,0 +1,52 @@
+"""add (meeting_id, created_at) index on meeting_notes
+
+Revision ID: 008_meeting_notes_created_at
+Revises: 007_keyset_pagination_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '008_meeting_notes_created_at'
+down_revision = '007_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # meetings (user_id, start_time DESC, id DESC) and
+    # knowledge_queries (user_id, created_at DESC, id DESC) already exist from 007
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_meeting_notes_meeting_id_created_at',
+            'meeting_notes',
+            ['meeting_id', 'created_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        # Superseded by the composite index (meeting_id is its leading column)
+        op.drop_index(
+            'ix_meeting_notes_meeting_id',
+            'meeting_notes',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_meeting_notes_meeting_id',
+            'meeting_notes',
+            ['meeting_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_meeting_notes_meeting_id_created_at',
+            'meeting_notes',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
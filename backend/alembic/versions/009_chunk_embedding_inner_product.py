@@ -0,0 +1,48 @@
+"""normalize chunk embeddings and index them for inner product
+
+Revision ID: 009_chunk_embedding_ip
+Revises: 008_meeting_notes_created_at
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009_chunk_embedding_ip'
+down_revision = '008_meeting_notes_created_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+
+    # Unit-length vectors make inner product rank identically to cosine,
+    # without the per-comparison norm computation
+    op.execute("""
+        UPDATE transcription_chunks
+        SET embedding = l2_normalize(embedding)
+        WHERE embedding IS NOT NULL
+    """)
+
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute("SET max_parallel_maintenance_workers = 7")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+        ON transcription_chunks
+        USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
+
+
+def downgrade():
+    # Normalized vectors are still valid for cosine, only the index changes
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+        ON transcription_chunks
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
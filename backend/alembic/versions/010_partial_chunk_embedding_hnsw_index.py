@@ -0,0 +1,42 @@
+"""restrict the chunk hnsw index to rows that have an embedding
+
+Revision ID: 010_partial_chunk_hnsw
+Revises: 009_chunk_embedding_ip
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '010_partial_chunk_hnsw'
+down_revision = '009_chunk_embedding_ip'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+
+    # Searches already filter on embedding IS NOT NULL, so the planner matches
+    # the partial predicate and the graph holds only real vectors
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute("SET max_parallel_maintenance_workers = 7")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+        ON transcription_chunks
+        USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = 24, ef_construction = 128)
+        WHERE embedding IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_chunks_embedding_hnsw")
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+        ON transcription_chunks
+        USING hnsw (embedding halfvec_ip_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
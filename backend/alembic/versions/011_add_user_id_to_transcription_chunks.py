@@ -0,0 +1,48 @@
+"""denormalize user_id onto transcription_chunks
+
+Revision ID: 011_chunk_user_id
+Revises: 010_partial_chunk_hnsw
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '011_chunk_user_id'
+down_revision = '010_partial_chunk_hnsw'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lets vector search filter chunks by owner without joining transcriptions first
+    op.add_column(
+        'transcription_chunks',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True)
+    )
+    op.create_foreign_key(
+        'fk_transcription_chunks_user_id',
+        'transcription_chunks', 'users',
+        ['user_id'], ['id'],
+        ondelete='CASCADE'
+    )
+
+    # Backfill from the owning transcription
+    op.execute("""
+        UPDATE transcription_chunks tc
+        SET user_id = t.user_id
+        FROM transcriptions t
+        WHERE t.id = tc.transcription_id
+          AND tc.user_id IS NULL
+    """)
+
+    op.create_index('ix_transcription_chunks_user_id', 'transcription_chunks', ['user_id'])
+
+
+def downgrade():
+    op.drop_index('ix_transcription_chunks_user_id', 'transcription_chunks')
+    op.drop_constraint('fk_transcription_chunks_user_id', 'transcription_chunks', type_='foreignkey')
+    op.drop_column('transcription_chunks', 'user_id')
@@ -0,0 +1,53 @@
+"""store transcriptions.embedding as halfvec
+
+Revision ID: 012_transcription_embedding_halfvec
+Revises: 011_chunk_user_id
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '012_transcription_embedding_halfvec'
+down_revision = '011_chunk_user_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The index is tied to the column type, drop it before converting
+    op.execute("DROP INDEX IF EXISTS idx_transcriptions_embedding")
+
+    # Same FP16 storage as the chunk embeddings: half the heap, TOAST and index memory
+    op.execute("""
+        ALTER TABLE transcriptions
+        ALTER COLUMN embedding TYPE halfvec(384)
+        USING embedding::halfvec(384)
+    """)
+
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transcriptions_embedding
+        ON transcriptions
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+        WHERE embedding IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_transcriptions_embedding")
+
+    op.execute("""
+        ALTER TABLE transcriptions
+        ALTER COLUMN embedding TYPE vector(384)
+        USING embedding::vector(384)
+    """)
+
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transcriptions_embedding
+        ON transcriptions
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
@@ -0,0 +1,38 @@
+"""add (user_id, status, created_at DESC) index on transcriptions
+
+Revision ID: 013_transcriptions_user_status
+Revises: 012_transcription_embedding_halfvec
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013_transcriptions_user_status'
+down_revision = '012_transcription_embedding_halfvec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves the transcription listing's user + status filter and newest-first sort
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transcriptions_user_status_created_at',
+            'transcriptions',
+            ['user_id', 'status', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_transcriptions_user_status_created_at',
+            'transcriptions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
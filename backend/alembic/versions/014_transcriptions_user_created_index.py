@@ -0,0 +1,40 @@
+"""add (user_id, created_at DESC) index on transcriptions
+
+Revision ID: 014_transcriptions_user_created
+Revises: 013_transcriptions_user_status
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_transcriptions_user_created'
+down_revision = '013_transcriptions_user_status'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The unfiltered listing (no status) sorts newest first per user; the
+    # 013 index puts status between user_id and created_at, so it can't
+    # supply that order without a sort
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transcriptions_user_created_at',
+            'transcriptions',
+            ['user_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_transcriptions_user_created_at',
+            'transcriptions',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
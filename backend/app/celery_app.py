@@ -0,0 +1,39 @@
+# backend/app/celery_app.py
+"""
+Celery Application
+Runs transcription jobs in dedicated worker processes, so heavy downloads,
+Whisper calls and summaries don't compete with request handling.
+
+Start a worker with: celery -A app.celery_app worker -c 8
+"""
+from celery import Celery
+from celery.signals import worker_process_init
+
+from .config import settings
+
+celery_app = Celery(
+    "transcription",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.tasks"]
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    # Jobs run for minutes: take one at a time and only ack once finished,
+    # so a crashed worker's job is redelivered instead of lost
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    result_expires=3600
+)
+
+
+@worker_process_init.connect
+def reset_db_pools(**kwargs):
+    """Give each forked worker process its own connection pools"""
+    from .database import dispose_engines
+
+    dispose_engines()
@@ -1,10 +1,16 @@
 # backend/app/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from pgvector.asyncpg import register_vector as register_vector_async
+from pgvector.psycopg2 import register_vector
 from .config import settings
 import logging
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +18,92 @@ logger = logging.getLogger(__name__)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
     echo=False  # Set to True for SQL debugging
 )
 
+@event.listens_for(engine, "connect")
+def register_pgvector(dbapi_connection, connection_record):
+    """Let psycopg2 adapt numpy arrays to/from vector columns natively"""
+    try:
+        register_vector(dbapi_connection)
+    except Exception as e:
+        # Extension missing (e.g. fresh database before migrations)
+        logger.warning(f"pgvector type registration skipped: {e}")
+
+def _log_slow_queries(target_engine) -> None:
+    """Warn about statements that take longer than DB_SLOW_QUERY_MS"""
+    if settings.DB_SLOW_QUERY_MS <= 0:
+        return
+
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(target_engine, "after_cursor_execute")
+    def log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        if elapsed_ms >= settings.DB_SLOW_QUERY_MS:
+            logger.warning(f"Slow query ({elapsed_ms:.0f}ms): {statement[:500]}")
+
+_log_slow_queries(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _async_database_url(url: str) -> URL:
+    """Point DATABASE_URL at the asyncpg driver (asyncpg takes ssl, not sslmode)"""
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    query = dict(async_url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    if settings.DB_USE_PGBOUNCER:
+        # SQLAlchemy's own prepared statement cache must be off as well
+        query["prepared_statement_cache_size"] = "0"
+    return async_url.set(query=query)
+
+def _async_connect_args() -> dict:
+    """asyncpg options; PgBouncer transaction mode can't keep named prepared statements"""
+    if not settings.DB_USE_PGBOUNCER:
+        return {}
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+# Create async database engine (asyncpg) so DB waits don't block the event loop
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    connect_args=_async_connect_args(),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    echo=False
+)
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def register_pgvector_async(dbapi_connection, connection_record):
+    """Register pgvector codecs on each asyncpg connection"""
+    try:
+        dbapi_connection.run_async(register_vector_async)
+    except Exception as e:
+        logger.warning(f"pgvector type registration skipped: {e}")
+
+_log_slow_queries(async_engine.sync_engine)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -36,6 +121,28 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            await db.rollback()
+            raise
+
+def dispose_engines() -> None:
+    """
+    Drop pooled connections inherited from a parent process
+
+    Called in forked workers so they open their own connections instead of
+    sharing the parent's sockets
+    """
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
 def init_db() -> None:
     """
     Initialize database tables
@@ -1,12 +1,15 @@
 # backend/app/main.py
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
 import logging
 import os
 
 from .config import settings
 from .database import engine, Base, get_db
+from .services.http_client import get_http_client, close_http_client
 from .routes import auth, transcriptions, knowledge, users, realtime, analytics, folders, calendar, meetings, recording, notes
 
 # Configure logging
@@ -19,12 +22,22 @@ logger = logging.getLogger(__name__)
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Tie process-wide resources to the app lifecycle"""
+    # Open the shared outbound HTTP pool
+    get_http_client()
+    yield
+    await close_http_client()
+
 app = FastAPI(
     title="Transcription Platform API",
     description="AI-powered transcription and knowledge base platform with Supabase + pgvector",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware - MUST be added before routes
@@ -3,7 +3,7 @@ from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ARRAY,
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 import uuid
 from datetime import datetime
 
@@ -73,7 +73,7 @@ class Transcription(Base):
     confidence_score = Column(Float)
     
     # Vector storage (pgvector - replaces Qdrant)
-    embedding = Column(Vector(384), nullable=True)
+    embedding = Column(HALFVEC(384), nullable=True)  # FP16, same as chunk embeddings
     
     # Settings
     generate_summary = Column(Boolean, default=True)
@@ -104,9 +104,10 @@ class TranscriptionChunk(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     transcription_id = Column(UUID(as_uuid=True), ForeignKey("transcriptions.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True)  # Denormalized for filtered vector search
     chunk_index = Column(Integer, nullable=False)
     text = Column(Text, nullable=False)
-    embedding = Column(Vector(384), nullable=True)
+    embedding = Column(HALFVEC(384), nullable=True)  # FP16 to halve ANN memory bandwidth
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
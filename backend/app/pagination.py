@@ -0,0 +1,30 @@
+# backend/app/pagination.py
+"""
+Keyset (cursor) pagination helpers
+A cursor is an opaque url-safe token holding the sort key and id of the last row on a page
+"""
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(sort_value: datetime, row_id) -> str:
+    """Build an opaque cursor from the last row's sort key and id"""
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Parse a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_raw, id_raw = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(sort_raw), UUID(id_raw)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -11,6 +11,7 @@ import logging
 from ..database import get_db
 from ..models import User
 from ..services.auth_service import get_current_user
+from ..services.cache_service import invalidate_transcription_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -158,22 +159,24 @@ async def delete_folder(
     try:
         # Move transcriptions if specified
         if move_to_folder_id:
-            db.execute(text("""
+            moved = db.execute(text("""
                 UPDATE transcriptions
                 SET folder_id = :new_folder_id
                 WHERE folder_id = :old_folder_id AND user_id = :user_id
+                RETURNING id
             """), {
                 "new_folder_id": move_to_folder_id,
                 "old_folder_id": folder_id,
                 "user_id": str(current_user.id)
-            })
+            }).scalars().all()
         else:
             # Set folder_id to NULL for transcriptions
-            db.execute(text("""
+            moved = db.execute(text("""
                 UPDATE transcriptions
                 SET folder_id = NULL
                 WHERE folder_id = :folder_id AND user_id = :user_id
-            """), {"folder_id": folder_id, "user_id": str(current_user.id)})
+                RETURNING id
+            """), {"folder_id": folder_id, "user_id": str(current_user.id)}).scalars().all()
 
         # Delete folder
         db.execute(text("""
@@ -182,6 +185,7 @@ async def delete_folder(
         """), {"folder_id": folder_id, "user_id": str(current_user.id)})
 
         db.commit()
+        await invalidate_transcription_cache(current_user.id, *moved)
         return {"message": "Folder deleted successfully"}
 
     except Exception as e:
@@ -198,16 +202,18 @@ async def move_to_folder(
 ):
     """Move transcription to folder"""
     try:
-        db.execute(text("""
+        moved = db.execute(text("""
             UPDATE transcriptions
             SET folder_id = :folder_id
             WHERE id = :transcription_id AND user_id = :user_id
+            RETURNING id
         """), {
             "folder_id": folder_id,
             "transcription_id": transcription_id,
             "user_id": str(current_user.id)
-        })
+        }).scalars().all()
         db.commit()
+        await invalidate_transcription_cache(current_user.id, *moved)
 
         return {"message": "Transcription moved successfully"}
 
@@ -1,22 +1,49 @@
 # backend/app/routes/knowledge.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select, func
+from pydantic import BaseModel, Field
 from typing import List, Optional
 import logging
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import User, Transcription, KnowledgeQuery
-from ..services.auth_service import get_current_user
-from ..services.knowledge_service import KnowledgeService
+from ..services.auth_service import get_current_user_async
+from ..services.knowledge_service import KnowledgeService, kb_debug_cache_key, KB_STATS_CACHE_TTL_SECONDS
+from ..services.cache_service import cache_get_json, cache_set_json
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Hot /search statement, built once at import so SQLAlchemy's compiled cache and
+# asyncpg's per-connection prepared statement cache skip parse/plan per request.
+# Behind PgBouncer (DB_USE_PGBOUNCER) server-side statement caching is disabled
+# in database.py and only the client-side compiled cache applies.
+# Embeddings are unit length so the negated inner product (<#>) ranks like
+# cosine distance at lower cost. CAST(:query_embedding AS halfvec) avoids :: syntax
+# issues with SQLAlchemy and matches the FP16 chunk column so the HNSW index is used.
+# Only the first 200 chars of each chunk are needed for the snippet,
+# truncate server-side so full multi-KB chunks never cross the wire.
+SEARCH_SNIPPETS_SQL = text("""
+    SELECT
+        tc.transcription_id,
+        LEFT(tc.text, 200) as snippet,
+        length(tc.text) > 200 as truncated,
+        t.filename,
+        t.created_at,
+        -1 * (tc.embedding <#> CAST(:query_embedding AS halfvec)) as similarity
+    FROM transcription_chunks tc
+    JOIN transcriptions t ON t.id = tc.transcription_id
+    WHERE tc.user_id = :user_id
+      AND tc.embedding IS NOT NULL  -- matches the partial HNSW index predicate
+    ORDER BY tc.embedding <#> CAST(:query_embedding AS halfvec)
+    LIMIT :limit
+""")
+
 # Pydantic models
 class QueryRequest(BaseModel):
     query: str
-    limit: Optional[int] = 5
+    limit: int = Field(5, ge=1, le=50)  # same bound as /search
     folder_id: Optional[str] = None  # Filter by folder
     source_type: Optional[str] = None  # Filter by source type (meeting, upload, recording)
 
@@ -40,6 +67,7 @@ class QueryHistoryResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
 
 class KnowledgeStatsResponse(BaseModel):
     transcription_count: int
@@ -53,8 +81,8 @@ class KnowledgeStatsResponse(BaseModel):
 @router.post("/query", response_model=QueryResponse)
 async def query_knowledge_base(
     query_request: QueryRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Query the user's knowledge base for information
@@ -101,28 +129,33 @@ async def query_knowledge_base(
 async def get_query_history(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get user's query history with pagination
+
+    Pass the returned next_cursor to fetch the following page in constant time;
+    page is only used when no cursor is given.
     """
     try:
         offset = (page - 1) * per_page
 
         knowledge_service = KnowledgeService(db)
-        queries = await knowledge_service.get_query_history(
-            user_id=current_user.id,
-            limit=per_page,
-            offset=offset
-        )
-        
-        # Get total count for pagination
-        from ..models import KnowledgeQuery
-        total = db.query(KnowledgeQuery).filter(
-            KnowledgeQuery.user_id == current_user.id
-        ).count()
-        
+        try:
+            queries, total, next_cursor = await knowledge_service.get_query_history(
+                user_id=current_user.id,
+                limit=per_page,
+                offset=offset,
+                cursor=cursor
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
         query_items = [
             QueryHistoryItem(
                 id=q["id"],
@@ -140,9 +173,12 @@ async def get_query_history(
             queries=query_items,
             total=total,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            next_cursor=next_cursor
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get query history: {e}")
         raise HTTPException(
@@ -152,8 +188,8 @@ async def get_query_history(
 
 @router.delete("/history")
 async def clear_query_history(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Clear all query history for the user
@@ -181,8 +217,8 @@ async def clear_query_history(
 
 @router.get("/stats", response_model=KnowledgeStatsResponse)
 async def get_knowledge_base_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get statistics about user's knowledge base
@@ -208,8 +244,8 @@ async def get_knowledge_base_stats(
 
 @router.delete("/clear")
 async def clear_knowledge_base(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Clear entire knowledge base (vectors and query history)
@@ -239,8 +275,8 @@ async def clear_knowledge_base(
 async def search_transcriptions(
     q: str = Query(..., min_length=1, max_length=1000),
     limit: int = Query(10, ge=1, le=50),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search transcriptions without generating an AI answer (using pgvector)
@@ -249,43 +285,30 @@ async def search_transcriptions(
         knowledge_service = KnowledgeService(db)
 
         # Generate query embedding
-        query_embedding = knowledge_service.model.encode(q).tolist()
-        vector_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
-
-        # Search using pgvector
-        # Note: We use CAST(:query_embedding AS vector) to avoid :: syntax issues with SQLAlchemy
-        search_results = db.execute(text("""
-            SELECT
-                tc.id,
-                tc.transcription_id,
-                tc.text,
-                tc.chunk_index,
-                t.filename,
-                t.created_at,
-                1 - (tc.embedding <=> CAST(:query_embedding AS vector)) as similarity
-            FROM transcription_chunks tc
-            JOIN transcriptions t ON t.id = tc.transcription_id
-            WHERE t.user_id = :user_id
-              AND tc.embedding IS NOT NULL
-            ORDER BY tc.embedding <=> CAST(:query_embedding AS vector)
-            LIMIT :limit
-        """), {
-            "query_embedding": vector_str,
+        query_embedding = await knowledge_service.encode_query(q)
+
+        # Size the HNSW candidate list to this user's collection (transaction-local)
+        await knowledge_service.apply_hnsw_params(current_user.id, limit)
+
+        result = await db.execute(SEARCH_SNIPPETS_SQL, {
+            "query_embedding": query_embedding,
             "user_id": str(current_user.id),
             "limit": limit
-        }).fetchall()
-
-        results = []
-        for row in search_results:
-            text = row[2]
-            results.append({
-                "transcription_id": str(row[1]),
-                "title": row[4] or "Untitled",
-                "text_snippet": text[:200] + "..." if len(text) > 200 else text,
+        })
+        search_results = result.fetchall()
+
+        results = [
+            {
+                "transcription_id": str(row.transcription_id),
+                "title": row.filename or "Untitled",
+                "text_snippet": row.snippet + "..." if row.truncated else row.snippet,
+                "text_truncated": row.truncated,
                 "type": "chunk",
-                "confidence": float(row[6]),
-                "created_at": row[5].isoformat() if row[5] else ""
-            })
+                "confidence": float(row.similarity),
+                "created_at": row.created_at.isoformat() if row.created_at else ""
+            }
+            for row in search_results
+        ]
 
         return {
             "results": results,
@@ -304,8 +327,9 @@ async def search_transcriptions(
 
 @router.get("/debug/status")
 async def debug_knowledge_status(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    full: bool = Query(False, description="Include chunk counts and recent transcriptions"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Debug endpoint to check knowledge base status"""
     try:
@@ -319,26 +343,46 @@ async def debug_knowledge_status(
             }
         }
 
+        # Service flags are free, the database lookups are opt-in
+        if not full:
+            return debug_info
+
+        cache_key = kb_debug_cache_key(current_user.id)
+        cached = await cache_get_json(cache_key)
+        if cached is not None:
+            return cached
+
         # Check pgvector chunks
-        chunk_count = db.execute(text("""
-            SELECT COUNT(*) FROM transcription_chunks tc
-            JOIN transcriptions t ON t.id = tc.transcription_id
-            WHERE t.user_id = :user_id AND tc.embedding IS NOT NULL
-        """), {"user_id": str(current_user.id)}).scalar()
+        result = await db.execute(text("""
+            SELECT COUNT(*) FROM transcription_chunks
+            WHERE user_id = :user_id AND embedding IS NOT NULL
+        """), {"user_id": str(current_user.id)})
+        chunk_count = result.scalar()
 
         debug_info["pgvector_status"] = {
             "chunks_with_embeddings": chunk_count
         }
 
         # Check database transcriptions
-        total_completed = db.query(Transcription).filter(
-            Transcription.user_id == current_user.id,
-            Transcription.status == "completed"
-        ).count()
+        total_completed = await db.scalar(
+            select(func.count(Transcription.id)).where(
+                Transcription.user_id == current_user.id,
+                Transcription.status == "completed"
+            )
+        )
 
-        recent_transcriptions = db.query(Transcription).filter(
-            Transcription.user_id == current_user.id
-        ).order_by(Transcription.created_at.desc()).limit(5).all()
+        # Only the listed columns, not full rows with transcript text and embeddings
+        result = await db.execute(
+            select(
+                Transcription.id,
+                Transcription.title,
+                Transcription.status,
+                Transcription.created_at
+            ).where(
+                Transcription.user_id == current_user.id
+            ).order_by(Transcription.created_at.desc()).limit(5)
+        )
+        recent_transcriptions = result.all()
 
         debug_info["database_status"] = {
             "total_completed": total_completed,
@@ -353,6 +397,7 @@ async def debug_knowledge_status(
             ]
         }
 
+        await cache_set_json(cache_key, debug_info, KB_STATS_CACHE_TTL_SECONDS)
         return debug_info
 
     except Exception as e:
@@ -362,8 +407,8 @@ async def debug_knowledge_status(
 @router.post("/debug/test-query")
 async def debug_test_query(
     query: str = "test query",
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Test a simple query to debug issues"""
     try:
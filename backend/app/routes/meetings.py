@@ -5,16 +5,18 @@ Handles viewing and managing synced calendar meetings
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, select, tuple_
 from typing import List, Optional
 from datetime import datetime, timedelta
+from uuid import UUID
 import logging
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import User, Meeting, CalendarConnection
-from ..services.auth_service import get_current_user
-from pydantic import BaseModel
+from ..pagination import encode_cursor, decode_cursor
+from ..services.auth_service import get_current_user_async
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +25,9 @@ router = APIRouter()
 
 # Pydantic schemas
 class MeetingResponse(BaseModel):
-    id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
     title: str
     description: Optional[str]
     start_time: datetime
@@ -34,28 +38,11 @@ class MeetingResponse(BaseModel):
     participants: Optional[str]
     status: str
     recording_status: str
-    calendar_connection_id: Optional[str]
-
-    class Config:
-        from_attributes = True
-
-    @classmethod
-    def from_orm(cls, obj):
-        # Convert UUID fields to strings
-        return cls(
-            id=str(obj.id),
-            title=obj.title,
-            description=obj.description,
-            start_time=obj.start_time,
-            end_time=obj.end_time,
-            timezone=obj.timezone,
-            platform=obj.platform,
-            meeting_url=obj.meeting_url,
-            participants=obj.participants,
-            status=obj.status,
-            recording_status=obj.recording_status,
-            calendar_connection_id=str(obj.calendar_connection_id) if obj.calendar_connection_id else None
-        )
+    calendar_connection_id: Optional[UUID]
+
+
+# Validates a whole result list from ORM attributes in one pydantic-core call
+meeting_list_adapter = TypeAdapter(List[MeetingResponse])
 
 
 class MeetingListResponse(BaseModel):
@@ -63,67 +50,95 @@ class MeetingListResponse(BaseModel):
     total: int
     upcoming_count: int
     past_count: int
+    next_cursor: Optional[str] = None
 
 
 @router.get("/meetings", response_model=MeetingListResponse)
 async def list_meetings(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
     status_filter: Optional[str] = Query(None, description="Filter by status: upcoming, past, all"),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ):
     """
     List all meetings for the current user
 
     - **status_filter**: upcoming, past, or all (default: all)
     - **limit**: Maximum number of meetings to return
-    - **offset**: Number of meetings to skip
+    - **offset**: Number of meetings to skip (ignored when cursor is given)
+    - **cursor**: Keyset cursor returned as next_cursor by the previous page
     """
     try:
+        cursor_key = None
+        if cursor:
+            try:
+                cursor_key = tuple_(*decode_cursor(cursor))
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+
         # Base query
-        query = db.query(Meeting).filter(Meeting.user_id == current_user.id)
+        query = select(Meeting).where(Meeting.user_id == current_user.id)
+        page_key = tuple_(Meeting.start_time, Meeting.id)
 
         # Apply status filter
         now = datetime.utcnow()
         if status_filter == "upcoming":
-            query = query.filter(Meeting.start_time >= now)
-            query = query.order_by(Meeting.start_time.asc())
-        elif status_filter == "past":
-            query = query.filter(Meeting.start_time < now)
-            query = query.order_by(Meeting.start_time.desc())
+            query = query.where(Meeting.start_time >= now)
+            page_query = query.order_by(Meeting.start_time.asc(), Meeting.id.asc())
+            if cursor_key is not None:
+                page_query = page_query.where(page_key > cursor_key)
         else:
+            if status_filter == "past":
+                query = query.where(Meeting.start_time < now)
             # Default: all meetings, sorted by start time descending
-            query = query.order_by(Meeting.start_time.desc())
-
-        # Get total count
-        total = query.count()
-
-        # Get upcoming and past counts
-        upcoming_count = db.query(Meeting).filter(
-            and_(
-                Meeting.user_id == current_user.id,
-                Meeting.start_time >= now
-            )
-        ).count()
+            page_query = query.order_by(Meeting.start_time.desc(), Meeting.id.desc())
+            if cursor_key is not None:
+                page_query = page_query.where(page_key < cursor_key)
+
+        # Get total, upcoming and past counts in a single aggregate scan
+        result = await db.execute(
+            select(
+                func.count(Meeting.id).label("total"),
+                func.count(Meeting.id).filter(Meeting.start_time >= now).label("upcoming"),
+                func.count(Meeting.id).filter(Meeting.start_time < now).label("past")
+            ).where(Meeting.user_id == current_user.id)
+        )
+        counts = result.one()
 
-        past_count = db.query(Meeting).filter(
-            and_(
-                Meeting.user_id == current_user.id,
-                Meeting.start_time < now
-            )
-        ).count()
+        upcoming_count = counts.upcoming
+        past_count = counts.past
+        if status_filter == "upcoming":
+            total = upcoming_count
+        elif status_filter == "past":
+            total = past_count
+        else:
+            total = counts.total
 
         # Apply pagination
-        meetings = query.limit(limit).offset(offset).all()
+        if cursor_key is None:
+            page_query = page_query.offset(offset)
+        result = await db.scalars(page_query.limit(limit))
+        meetings = result.all()
+
+        next_cursor = None
+        if len(meetings) == limit:
+            next_cursor = encode_cursor(meetings[-1].start_time, meetings[-1].id)
 
         return MeetingListResponse(
-            meetings=[MeetingResponse.from_orm(m) for m in meetings],
+            meetings=meeting_list_adapter.validate_python(meetings, from_attributes=True),
             total=total,
             upcoming_count=upcoming_count,
-            past_count=past_count
+            past_count=past_count,
+            next_cursor=next_cursor
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing meetings: {e}")
         raise HTTPException(
@@ -134,8 +149,8 @@ async def list_meetings(
 
 @router.get("/meetings/upcoming", response_model=List[MeetingResponse])
 async def get_upcoming_meetings(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
     hours_ahead: int = Query(24, ge=1, le=168, description="Hours ahead to look")
 ):
     """
@@ -147,15 +162,18 @@ async def get_upcoming_meetings(
         now = datetime.utcnow()
         end_time = now + timedelta(hours=hours_ahead)
 
-        meetings = db.query(Meeting).filter(
-            and_(
-                Meeting.user_id == current_user.id,
-                Meeting.start_time >= now,
-                Meeting.start_time <= end_time
-            )
-        ).order_by(Meeting.start_time.asc()).all()
+        result = await db.scalars(
+            select(Meeting).where(
+                and_(
+                    Meeting.user_id == current_user.id,
+                    Meeting.start_time >= now,
+                    Meeting.start_time <= end_time
+                )
+            ).order_by(Meeting.start_time.asc())
+        )
+        meetings = result.all()
 
-        return [MeetingResponse.from_orm(m) for m in meetings]
+        return meeting_list_adapter.validate_python(meetings, from_attributes=True)
 
     except Exception as e:
         logger.error(f"Error getting upcoming meetings: {e}")
@@ -168,19 +186,21 @@ async def get_upcoming_meetings(
 @router.get("/meetings/{meeting_id}", response_model=MeetingResponse)
 async def get_meeting(
     meeting_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific meeting by ID
     """
     try:
-        meeting = db.query(Meeting).filter(
-            and_(
-                Meeting.id == meeting_id,
-                Meeting.user_id == current_user.id
+        meeting = await db.scalar(
+            select(Meeting).where(
+                and_(
+                    Meeting.id == meeting_id,
+                    Meeting.user_id == current_user.id
+                )
             )
-        ).first()
+        )
 
         if not meeting:
             raise HTTPException(
@@ -188,7 +208,7 @@ async def get_meeting(
                 detail="Meeting not found"
             )
 
-        return MeetingResponse.from_orm(meeting)
+        return MeetingResponse.model_validate(meeting)
 
     except HTTPException:
         raise
@@ -202,8 +222,8 @@ async def get_meeting(
 
 @router.get("/meetings/today")
 async def get_todays_meetings(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all meetings for today
@@ -214,15 +234,18 @@ async def get_todays_meetings(
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         today_end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-        meetings = db.query(Meeting).filter(
-            and_(
-                Meeting.user_id == current_user.id,
-                Meeting.start_time >= today_start,
-                Meeting.start_time <= today_end
-            )
-        ).order_by(Meeting.start_time.asc()).all()
+        result = await db.scalars(
+            select(Meeting).where(
+                and_(
+                    Meeting.user_id == current_user.id,
+                    Meeting.start_time >= today_start,
+                    Meeting.start_time <= today_end
+                )
+            ).order_by(Meeting.start_time.asc())
+        )
+        meetings = result.all()
 
-        return [MeetingResponse.from_orm(m) for m in meetings]
+        return meeting_list_adapter.validate_python(meetings, from_attributes=True)
 
     except Exception as e:
         logger.error(f"Error getting today's meetings: {e}")
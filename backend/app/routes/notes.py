@@ -5,16 +5,20 @@ Handles CRUD operations for meeting notes (manual, AI, and hybrid)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, exists, insert, literal, select
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 import logging
+import orjson
+import uuid
+from uuid import UUID
 
-from ..database import get_db
+from ..database import AsyncSessionLocal, get_async_db
 from ..models import User, Meeting, MeetingNote
-from ..services.auth_service import get_current_user
-from pydantic import BaseModel
+from ..services.auth_service import get_current_user_async
+from pydantic import BaseModel, ConfigDict
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +41,11 @@ class NoteUpdate(BaseModel):
     section: Optional[str] = None
 
 class NoteResponse(BaseModel):
-    id: str
-    meeting_id: str
-    user_id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    meeting_id: UUID
+    user_id: UUID
     content: str
     note_type: str
     section: Optional[str]
@@ -48,23 +54,30 @@ class NoteResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
-    @classmethod
-    def from_orm(cls, obj):
-        return cls(
-            id=str(obj.id),
-            meeting_id=str(obj.meeting_id),
-            user_id=str(obj.user_id),
-            content=obj.content,
-            note_type=obj.note_type,
-            section=obj.section,
-            timestamp_in_meeting=obj.timestamp_in_meeting,
-            speaker=obj.speaker,
-            created_at=obj.created_at,
-            updated_at=obj.updated_at
-        )
+
+# Rows fetched per round trip when streaming a meeting's notes
+NOTES_STREAM_BATCH_SIZE = 500
+
+
+def _note_json(note: MeetingNote) -> bytes:
+    """Serialize one note with orjson (handles UUID and datetime natively)"""
+    return orjson.dumps(NoteResponse.model_validate(note).model_dump())
+
+
+async def _stream_notes_json(query) -> AsyncIterator[bytes]:
+    """
+    Emit a JSON array one note at a time so memory stays bounded
+
+    Runs on its own session: the body is sent after the handler returns, and
+    the request's session dependency may already be closed by then.
+    """
+    async with AsyncSessionLocal() as db:
+        notes = await db.stream_scalars(query)
+        separator = b"["
+        async for note in notes:
+            yield separator + _note_json(note)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
 
 
 # ========================================
@@ -74,8 +87,8 @@ class NoteResponse(BaseModel):
 @router.post("/notes", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
 async def create_note(
     note_data: NoteCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new meeting note
@@ -86,43 +99,56 @@ async def create_note(
     - **section**: Optional section (agenda, discussion, etc.)
     """
     try:
-        # Verify meeting exists and user has access
-        meeting = db.query(Meeting).filter(
-            and_(
-                Meeting.id == note_data.meeting_id,
-                Meeting.user_id == current_user.id
+        # Insert only if the meeting exists and belongs to the user:
+        # INSERT ... SELECT ... WHERE EXISTS (...) RETURNING * in one round trip
+        now = datetime.utcnow()
+        values = {
+            "id": uuid.uuid4(),
+            "meeting_id": note_data.meeting_id,
+            "user_id": current_user.id,
+            "content": note_data.content,
+            "note_type": note_data.note_type,
+            "section": note_data.section,
+            "timestamp_in_meeting": note_data.timestamp_in_meeting,
+            "created_at": now,
+            "updated_at": now
+        }
+        notes_table = MeetingNote.__table__
+        authorized_row = select(
+            *[literal(value, notes_table.c[name].type) for name, value in values.items()]
+        ).where(
+            exists().where(
+                and_(
+                    Meeting.id == note_data.meeting_id,
+                    Meeting.user_id == current_user.id
+                )
             )
-        ).first()
+        )
 
-        if not meeting:
+        result = await db.execute(
+            insert(notes_table)
+            .from_select(list(values), authorized_row)
+            .returning(*notes_table.c)
+        )
+        note = result.first()
+
+        if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Meeting not found"
             )
 
-        # Create note
-        note = MeetingNote(
-            meeting_id=note_data.meeting_id,
-            user_id=current_user.id,
-            content=note_data.content,
-            note_type=note_data.note_type,
-            section=note_data.section,
-            timestamp_in_meeting=note_data.timestamp_in_meeting
-        )
-
-        db.add(note)
-        db.commit()
-        db.refresh(note)
+        await db.commit()
 
         logger.info(f"Created note {note.id} for meeting {note_data.meeting_id}")
 
-        return NoteResponse.from_orm(note)
+        return NoteResponse.model_validate(note)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error creating note: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create note: {str(e)}"
@@ -132,8 +158,8 @@ async def create_note(
 @router.get("/meetings/{meeting_id}/notes", response_model=List[NoteResponse])
 async def get_meeting_notes(
     meeting_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
     note_type: Optional[str] = None,
     section: Optional[str] = None
 ):
@@ -145,35 +171,47 @@ async def get_meeting_notes(
     - **section**: Filter by section
     """
     try:
-        # Verify meeting access
-        meeting = db.query(Meeting).filter(
-            and_(
-                Meeting.id == meeting_id,
-                Meeting.user_id == current_user.id
-            )
-        ).first()
-
-        if not meeting:
+        # 404 has to be decided before the streamed 200 goes out
+        meeting_exists = await db.scalar(
+            select(exists().where(
+                and_(
+                    Meeting.id == meeting_id,
+                    Meeting.user_id == current_user.id
+                )
+            ))
+        )
+        if not meeting_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Meeting not found"
             )
 
-        # Build query
-        query = db.query(MeetingNote).filter(
-            MeetingNote.meeting_id == meeting_id
+        # Still joined through the meeting so the stream only ever sees
+        # this user's notes
+        query = select(MeetingNote).join(
+            Meeting, Meeting.id == MeetingNote.meeting_id
+        ).where(
+            and_(
+                Meeting.id == meeting_id,
+                Meeting.user_id == current_user.id
+            )
         )
 
         # Apply filters
         if note_type:
-            query = query.filter(MeetingNote.note_type == note_type)
+            query = query.where(MeetingNote.note_type == note_type)
         if section:
-            query = query.filter(MeetingNote.section == section)
-
-        # Order by creation time
-        notes = query.order_by(MeetingNote.created_at.asc()).all()
-
-        return [NoteResponse.from_orm(note) for note in notes]
+            query = query.where(MeetingNote.section == section)
+
+        # Order by creation time and stream in batches instead of .all(),
+        # meetings with thousands of AI notes would otherwise be held twice
+        return StreamingResponse(
+            _stream_notes_json(
+                query.order_by(MeetingNote.created_at.asc())
+                .execution_options(yield_per=NOTES_STREAM_BATCH_SIZE)
+            ),
+            media_type="application/json"
+        )
 
     except HTTPException:
         raise
@@ -188,19 +226,21 @@ async def get_meeting_notes(
 @router.get("/notes/{note_id}", response_model=NoteResponse)
 async def get_note(
     note_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific note by ID
     """
     try:
-        note = db.query(MeetingNote).filter(
-            and_(
-                MeetingNote.id == note_id,
-                MeetingNote.user_id == current_user.id
+        note = await db.scalar(
+            select(MeetingNote).where(
+                and_(
+                    MeetingNote.id == note_id,
+                    MeetingNote.user_id == current_user.id
+                )
             )
-        ).first()
+        )
 
         if not note:
             raise HTTPException(
@@ -208,7 +248,7 @@ async def get_note(
                 detail="Note not found"
             )
 
-        return NoteResponse.from_orm(note)
+        return NoteResponse.model_validate(note)
 
     except HTTPException:
         raise
@@ -224,19 +264,21 @@ async def get_note(
 async def update_note(
     note_id: str,
     note_data: NoteUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a note
     """
     try:
-        note = db.query(MeetingNote).filter(
-            and_(
-                MeetingNote.id == note_id,
-                MeetingNote.user_id == current_user.id
+        note = await db.scalar(
+            select(MeetingNote).where(
+                and_(
+                    MeetingNote.id == note_id,
+                    MeetingNote.user_id == current_user.id
+                )
             )
-        ).first()
+        )
 
         if not note:
             raise HTTPException(
@@ -252,18 +294,18 @@ async def update_note(
 
         note.updated_at = datetime.utcnow()
 
-        db.commit()
-        db.refresh(note)
+        await db.commit()
+        await db.refresh(note)
 
         logger.info(f"Updated note {note_id}")
 
-        return NoteResponse.from_orm(note)
+        return NoteResponse.model_validate(note)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error updating note {note_id}: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update note"
@@ -273,19 +315,21 @@ async def update_note(
 @router.delete("/notes/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_note(
     note_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a note
     """
     try:
-        note = db.query(MeetingNote).filter(
-            and_(
-                MeetingNote.id == note_id,
-                MeetingNote.user_id == current_user.id
+        note = await db.scalar(
+            select(MeetingNote).where(
+                and_(
+                    MeetingNote.id == note_id,
+                    MeetingNote.user_id == current_user.id
+                )
             )
-        ).first()
+        )
 
         if not note:
             raise HTTPException(
@@ -293,8 +337,8 @@ async def delete_note(
                 detail="Note not found"
             )
 
-        db.delete(note)
-        db.commit()
+        await db.delete(note)
+        await db.commit()
 
         logger.info(f"Deleted note {note_id}")
 
@@ -304,7 +348,7 @@ async def delete_note(
         raise
     except Exception as e:
         logger.error(f"Error deleting note {note_id}: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete note"
@@ -1,28 +1,137 @@
 # backend/app/routes/realtime.py - Enhanced version
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
-import tempfile
-import os
+import asyncio
+import contextlib
 import logging
+import re
+import aiofiles
+import aiofiles.os
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
+import itertools
+import os
+import shutil
+import tempfile
 import uuid
-import asyncio
-from collections import defaultdict
 import time
+from collections import deque
+from cachetools import TTLCache
 
+from ..config import settings
 from ..database import get_db
 from ..models import User, Transcription
 from ..services.auth_service import get_current_user
 from ..services.transcription_service import TranscriptionService
+from .transcriptions import check_usage_limits
+from ..services.realtime_chunk_batcher import RealtimeChunkBatcher
+from ..services.simhash import simhash, hamming_distance
+from ..services.wav_utils import pcm16_rms
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 transcription_service = TranscriptionService()
 
-# Store partial transcription contexts for continuous streaming
-transcription_contexts = defaultdict(dict)
+# Coalesces a user's overlapping /realtime-stream chunks into one Groq request
+chunk_batcher = RealtimeChunkBatcher(transcription_service)
+
+# EBML header that starts every standalone WebM file
+WEBM_MAGIC = b"\x1aE\xdf\xa3"
+
+# Chunks quieter than this RMS level (0..1) are silence, not worth a Groq call
+SILENCE_RMS_THRESHOLD = 0.005
+
+# Chunks a single user may have in ffmpeg at once, extra ones queue. Groq calls
+# are outside this bound, the batcher coalesces a user's overlapping chunks
+USER_MAX_INFLIGHT_CHUNKS = 2
+
+# Chunks whose fingerprint is within this many bits of a recent one are repeats
+REPETITION_MAX_DISTANCE = 4
+# More than three words ending in sentence punctuation, checked in one pass
+_FINAL_SENTENCE_RE = re.compile(r'\S+(?:\s+\S+){3,}(?<=[.!?])')
+
+# Normalized sentence hashes remembered per session for exact-repeat detection
+MAX_SEEN_SENTENCES = 256
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# accumulated_text only feeds the prompt context, keep the tail of the session
+MAX_ACCUMULATED_TEXT_CHARS = 2048
+
+
+def _sentence_hashes(text: str) -> set:
+    """Hashes of the lowercased, punctuation-trimmed sentences in text"""
+    sentences = (part.strip(' .!?,').lower() for part in _SENTENCE_SPLIT_RE.split(text))
+    return {hash(sentence) for sentence in sentences if sentence}
+
+
+def _append_final_text(context: dict, text: str):
+    """
+    Add a final chunk to the session's prompt context
+
+    Chunks are kept as separate parts so the oldest can be dropped whole once
+    the cap is exceeded; the prompt string is joined once per final chunk.
+    """
+    parts = context['accumulated_parts']
+    parts.append(text)
+    context['accumulated_chars'] += len(text) + 1
+    while context['accumulated_chars'] > MAX_ACCUMULATED_TEXT_CHARS and len(parts) > 1:
+        context['accumulated_chars'] -= len(parts.popleft()) + 1
+    context['accumulated_text'] = ' '.join(parts)
+
+
+# Per-user outcome of the usage limit check, chunks arrive every few seconds
+usage_check_cache = TTLCache(maxsize=50_000, ttl=30)
+
+
+def check_usage_limits_cached(user: User, db: Session):
+    """check_usage_limits, reusing the result for a user for 30 seconds"""
+    user_id = str(user.id)
+    cached = usage_check_cache.get(user_id)
+    if cached is None:
+        try:
+            check_usage_limits(user, db)
+            cached = True
+        except HTTPException as e:
+            cached = e
+        usage_check_cache[user_id] = cached
+
+    if isinstance(cached, HTTPException):
+        raise cached
+
+def _spool_upload(upload_file, suffix: str) -> Tuple[str, int]:
+    """
+    Copy an upload to a named temp file without reading it into memory
+
+    Returns:
+        Temp file path (owned by the caller) and its size in bytes
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        try:
+            shutil.copyfileobj(upload_file, temp_file, 1 << 20)
+        except BaseException:
+            os.unlink(temp_file.name)
+            raise
+        return temp_file.name, temp_file.tell()
+
+
+_transcription_id_counter = itertools.count()
+
+
+def _new_transcription_id(user_id: str) -> uuid.UUID:
+    """
+    Derive a transcription id from the user, clock, pid and a counter
+
+    Avoids the getrandom() syscall behind uuid4; the column stays a UUID and
+    the version/variant bits are set so the value is still a well-formed v4.
+    """
+    seed = f"{user_id}-{time.time_ns()}-{os.getpid()}-{next(_transcription_id_counter)}"
+    return uuid.UUID(bytes=hashlib.blake2b(seed.encode(), digest_size=16).digest(), version=4)
+
+# Store partial transcription contexts for continuous streaming.
+# Bounded, and entries expire 30 minutes after their last chunk
+transcription_contexts = TTLCache(maxsize=10_000, ttl=1800, timer=time.monotonic)
 
 @router.post("/realtime-chunk")
 async def realtime_transcription_chunk(
@@ -34,26 +143,17 @@ async def realtime_transcription_chunk(
     Process real-time audio chunks for live transcription (legacy endpoint)
     """
     try:
-        # Check usage limits
-        from ..routes.transcriptions import check_usage_limits
-        check_usage_limits(current_user, db)
-        
-        # Save uploaded chunk to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_file:
-            content = await audio.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        # Check usage limits (cached briefly, this runs for every chunk)
+        check_usage_limits_cached(current_user, db)
         
-        try:
-            # Transcribe live chunk directly (works with WebM, no conversion needed)
-            transcription = await transcription_service._transcribe_live_chunk(temp_path)
+        content = await audio.read()
 
-            return {"text": transcription, "status": "success"}
+        # Transcribe live chunk directly from memory (works with WebM, no conversion needed)
+        transcription = await transcription_service._transcribe_live_chunk(
+            content, audio.filename or "chunk.webm"
+        )
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+        return {"text": transcription, "status": "success"}
                 
     except Exception as e:
         logger.error(f"Real-time transcription failed: {e}")
@@ -71,9 +171,8 @@ async def realtime_transcription_stream(
     Enhanced real-time transcription with continuous streaming support
     """
     try:
-        # Check usage limits
-        from ..routes.transcriptions import check_usage_limits
-        check_usage_limits(current_user, db)
+        # Check usage limits (cached briefly, this runs for every chunk)
+        check_usage_limits_cached(current_user, db)
         
         user_id = str(current_user.id)
         session_timestamp = timestamp
@@ -82,26 +181,26 @@ async def realtime_transcription_stream(
         if user_id not in transcription_contexts:
             transcription_contexts[user_id] = {
                 'session_start': time.time(),
+                'accumulated_parts': deque(),
+                'accumulated_chars': 0,
                 'accumulated_text': '',
-                'last_final_text': '',
                 'chunk_count': 0,
-                'last_update': time.time()
+                'last_update': time.time(),
+                'recent_hashes': deque(maxlen=32),
+                'seen_sentences': {},
+                'inflight': asyncio.Semaphore(USER_MAX_INFLIGHT_CHUNKS)
             }
         
         context = transcription_contexts[user_id]
         context['chunk_count'] += 1
         context['last_update'] = time.time()
+        # Re-insert so the TTL counts from this chunk, not the session start
+        transcription_contexts[user_id] = context
         
-        # Save uploaded chunk to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_file:
-            content = await audio.read()
-            temp_file.write(content)
-            temp_path = temp_file.name
+        content = await audio.read()
         
         # Skip very small chunks (less than 2KB)
         if len(content) < 2048:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
             return {
                 "text": "",
                 "is_final": False,
@@ -109,62 +208,95 @@ async def realtime_transcription_stream(
                 "message": "Chunk too small"
             }
         
-        try:
-            # Convert webm to wav if needed
-            wav_path = await transcription_service._convert_to_wav(temp_path)
+        # Bound this user's concurrent transcodes so a client firing
+        # overlapping chunks can't starve everyone else
+        async with context['inflight']:
+            if settings.REALTIME_WEBM_PASSTHROUGH and content[:4] == WEBM_MAGIC:
+                # Groq decodes standalone WebM/Opus itself, skip the transcode
+                audio_bytes, audio_filename = content, audio.filename or "chunk.webm"
+            else:
+                # Convert webm to wav through ffmpeg pipes, no temp files involved
+                audio_bytes, audio_filename = await transcription_service._convert_bytes_to_wav(
+                    content, audio.filename or "chunk.webm"
+                )
             
-            # Enhanced transcription with context awareness
-            transcription = await transcription_service._transcribe_with_groq_streaming(
-                wav_path, 
-                context=context.get('accumulated_text', ''),
-                chunk_number=context['chunk_count']
-            )
+            # Skip silent chunks (typing pauses etc.) before they reach Groq.
+            # Only possible for PCM, passthrough WebM returns None here
+            rms = pcm16_rms(audio_bytes)
+            if rms is not None and rms < SILENCE_RMS_THRESHOLD:
+                return {
+                    "text": "",
+                    "is_final": False,
+                    "status": "success",
+                    "message": "Silence"
+                }
+        
+        # Enhanced transcription with context awareness, batched with any
+        # other chunks from this user arriving in the same window. Outside the
+        # semaphore, otherwise it would cap a batch at USER_MAX_INFLIGHT_CHUNKS
+        transcription = await chunk_batcher.submit(
+            user_id,
+            audio_bytes,
+            audio_filename,
+            context=context.get('accumulated_text', ''),
+            chunk_number=context['chunk_count']
+        )
+        
+        # Determine if this is a final transcription or partial
+        is_final = False
+        clean_transcription = transcription.strip()
+        
+        if clean_transcription:
+            # Simple heuristic: if transcription ends with punctuation and is substantial, 
+            # consider it more "final"
+            if (context['chunk_count'] % 4 == 0 and  # Every 4th chunk can be "final"
+                _FINAL_SENTENCE_RE.fullmatch(clean_transcription)):
+                is_final = True
+                _append_final_text(context, clean_transcription)
             
-            # Determine if this is a final transcription or partial
-            is_final = False
-            clean_transcription = transcription.strip()
+            # Filter out repetitive transcriptions by comparing fingerprints
+            # with the last 32 chunks instead of scanning the whole session
+            fingerprint = simhash(clean_transcription.lower().split())
+            is_repetitive = any(
+                hamming_distance(fingerprint, previous) < REPETITION_MAX_DISTANCE
+                for previous in context['recent_hashes']
+            )
+            context['recent_hashes'].append(fingerprint)
             
-            if clean_transcription:
-                # Simple heuristic: if transcription ends with punctuation and is substantial, 
-                # consider it more "final"
-                if (clean_transcription.endswith(('.', '!', '?')) and 
-                    len(clean_transcription.split()) > 3 and
-                    context['chunk_count'] % 4 == 0):  # Every 4th chunk can be "final"
-                    is_final = True
-                    context['last_final_text'] = context['accumulated_text'] + ' ' + clean_transcription
-                    context['accumulated_text'] = context['last_final_text']
-                
-                # Filter out repetitive transcriptions
-                if clean_transcription.lower() not in context.get('accumulated_text', '').lower():
-                    return {
-                        "text": clean_transcription,
-                        "is_final": is_final,
-                        "status": "success",
-                        "chunk_number": context['chunk_count'],
-                        "session_duration": time.time() - context['session_start']
-                    }
-                else:
-                    # Return empty if repetitive
-                    return {
-                        "text": "",
-                        "is_final": False,
-                        "status": "success", 
-                        "message": "Filtered repetitive content"
-                    }
+            # Also drop chunks made only of sentences already returned this
+            # session, which the fingerprint window can miss once they age out
+            sentence_hashes = _sentence_hashes(clean_transcription)
+            seen_sentences = context['seen_sentences']
+            if sentence_hashes and all(h in seen_sentences for h in sentence_hashes):
+                is_repetitive = True
+            for h in sentence_hashes:
+                seen_sentences[h] = None
+            while len(seen_sentences) > MAX_SEEN_SENTENCES:
+                del seen_sentences[next(iter(seen_sentences))]
             
-            return {
-                "text": clean_transcription,
-                "is_final": is_final,
-                "status": "success",
-                "chunk_number": context['chunk_count']
-            }
-            
-        finally:
-            # Clean up temporary files
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            if 'wav_path' in locals() and os.path.exists(wav_path):
-                os.remove(wav_path)
+            if not is_repetitive:
+                return {
+                    "text": clean_transcription,
+                    "is_final": is_final,
+                    "status": "success",
+                    "chunk_number": context['chunk_count'],
+                    "session_duration": time.time() - context['session_start']
+                }
+            else:
+                # Return empty if repetitive
+                return {
+                    "text": "",
+                    "is_final": False,
+                    "status": "success", 
+                    "message": "Filtered repetitive content"
+                }
+        
+        return {
+            "text": clean_transcription,
+            "is_final": is_final,
+            "status": "success",
+            "chunk_number": context['chunk_count']
+        }
                 
     except Exception as e:
         logger.error(f"Real-time streaming transcription failed: {e}")
@@ -186,9 +318,9 @@ async def complete_realtime_transcription(
     """
     Process complete real-time recording with summary and knowledge base storage
     """
+    temp_path = None
     try:
         # Check usage limits
-        from ..routes.transcriptions import check_usage_limits
         check_usage_limits(current_user, db)
         
         # Clean up user's transcription context
@@ -196,13 +328,17 @@ async def complete_realtime_transcription(
         if user_id in transcription_contexts:
             del transcription_contexts[user_id]
         
+        # Copy the spooled upload to disk in 1MB pieces within one worker thread,
+        # rather than a threadpool hop per read and per write
+        temp_path, file_size = await asyncio.to_thread(_spool_upload, audio.file, ".webm")
+        
         # Create transcription record
         transcription = Transcription(
-            id=str(uuid.uuid4()),
+            id=_new_transcription_id(user_id),
             user_id=current_user.id,
             title=title,
             file_type="webm",
-            file_size=len(await audio.read()),
+            file_size=file_size,
             language="auto",
             status="processing",
             generate_summary=True,
@@ -210,16 +346,13 @@ async def complete_realtime_transcription(
             created_at=datetime.utcnow()
         )
         
-        # Reset file pointer
-        await audio.seek(0)
-        
         db.add(transcription)
         db.commit()
         db.refresh(transcription)
         
         # Process the complete recording
         result = await transcription_service.process_complete_realtime_recording(
-            transcription, audio, db
+            transcription, temp_path, db
         )
         
         return result
@@ -228,6 +361,10 @@ async def complete_realtime_transcription(
         logger.error(f"Complete real-time transcription failed: {e}")
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if temp_path:
+            with contextlib.suppress(FileNotFoundError):
+                await aiofiles.os.remove(temp_path)
 
 @router.delete("/realtime-session")
 async def clear_realtime_session(
@@ -242,41 +379,3 @@ async def clear_realtime_session(
         return {"status": "success", "message": "Session context cleared"}
     
     return {"status": "success", "message": "No active session found"}
-
-# Background task to clean up old contexts (prevent memory leaks)
-async def cleanup_old_contexts():
-    """
-    Clean up transcription contexts older than 30 minutes
-    """
-    current_time = time.time()
-    expired_users = []
-    
-    for user_id, context in transcription_contexts.items():
-        if current_time - context.get('last_update', 0) > 1800:  # 30 minutes
-            expired_users.append(user_id)
-    
-    for user_id in expired_users:
-        del transcription_contexts[user_id]
-        logger.info(f"Cleaned up expired transcription context for user {user_id}")
-
-# Initialize cleanup task on startup
-import atexit
-cleanup_task = None
-
-def start_cleanup_task():
-    global cleanup_task
-    if cleanup_task is None:
-        async def periodic_cleanup():
-            while True:
-                await asyncio.sleep(600)  # Run every 10 minutes
-                await cleanup_old_contexts()
-        
-        cleanup_task = asyncio.create_task(periodic_cleanup())
-
-def stop_cleanup_task():
-    global cleanup_task
-    if cleanup_task:
-        cleanup_task.cancel()
-
-# Register cleanup on exit
-atexit.register(stop_cleanup_task)
@@ -4,19 +4,25 @@ Recording Routes - Real-time Meeting Recording
 Handles starting/stopping recording sessions and WebSocket connections
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from typing import Optional
 from datetime import datetime
 import logging
-import json
 import asyncio
+import orjson
+from array import array
+import time
+import uuid
+from cachetools import TTLCache
 
-from ..database import get_db
+from ..database import get_db, SessionLocal
 from ..models import User, Meeting, Transcription
 from ..services.auth_service import get_current_user
+from ..services.cache_service import invalidate_transcription_cache
 from ..services.realtime_transcription_service import RealtimeTranscriptionService
+from ..services.groq_service import GroqTranscriptionService
 from ..config import settings
 from pydantic import BaseModel
 
@@ -30,6 +36,9 @@ transcription_service = RealtimeTranscriptionService(
     buffer_duration=5  # Process every 5 seconds of audio
 )
 
+# Shared Groq client for meeting summaries
+groq_service = GroqTranscriptionService(api_key=settings.GROQ_API_KEY)
+
 
 # ========================================
 # Pydantic Schemas
@@ -60,8 +69,17 @@ class StopRecordingResponse(BaseModel):
 # ========================================
 
 # In-memory store for active recording sessions
-# In production, use Redis for distributed systems
-active_sessions = {}
+# In production, use Redis for distributed systems.
+# Bounded, and sessions abandoned without /recording/stop expire after 12 hours
+ACTIVE_SESSION_TTL_SECONDS = 12 * 3600
+active_sessions = TTLCache(maxsize=10_000, ttl=ACTIVE_SESSION_TTL_SECONDS, timer=time.monotonic)
+
+# Queued audio per session before the oldest half is dropped (slow transcription).
+# This is the only bound on the audio queue, so the receive loop never waits on it
+MAX_QUEUED_AUDIO_BYTES = 10 * 1024 * 1024
+
+# Chunks (~1 second each) combined into one transcription request
+CHUNKS_PER_TRANSCRIPTION = 5
 
 
 @router.post("/recording/start", response_model=StartRecordingResponse)
@@ -99,8 +117,10 @@ async def start_recording(
                 detail="Meeting is already being recorded"
             )
 
-        # Create a new transcription record
+        # Create a new transcription record. The id is generated here rather
+        # than by a flush, so the insert and meeting update share one commit
         transcription = Transcription(
+            id=uuid.uuid4(),
             user_id=current_user.id,
             title=f"{meeting.title} - Recording",
             status="processing",
@@ -111,7 +131,6 @@ async def start_recording(
             add_to_knowledge_base=True
         )
         db.add(transcription)
-        db.flush()  # Get the ID without committing
 
         # Update meeting
         meeting.recording_status = "recording"
@@ -119,25 +138,30 @@ async def start_recording(
         meeting.transcription_id = transcription.id
         meeting.status = "in_progress"
 
+        # Read before commit expires the instances, which would reload both rows
+        session_id = str(transcription.id)
+        meeting_id = str(meeting.id)
+
         db.commit()
-        db.refresh(transcription)
 
         # Create session
-        session_id = str(transcription.id)
         active_sessions[session_id] = {
-            "meeting_id": str(meeting.id),
-            "transcription_id": str(transcription.id),
+            "meeting_id": meeting_id,
+            "transcription_id": session_id,
             "user_id": str(current_user.id),
-            "started_at": datetime.utcnow(),
-            "audio_buffer": [],
-            "transcript_chunks": []
+            # Monotonic, so elapsed time is immune to wall-clock adjustments
+            "started_monotonic": time.monotonic(),
+            "audio_queue": asyncio.Queue(),
+            "queued_bytes": 0,
+            "transcript_texts": [],
+            "transcript_confidences": array("f")
         }
 
-        logger.info(f"Started recording session {session_id} for meeting {meeting.id}")
+        logger.info(f"Started recording session {session_id} for meeting {meeting_id}")
 
         return StartRecordingResponse(
             session_id=session_id,
-            meeting_id=str(meeting.id),
+            meeting_id=meeting_id,
             websocket_url=f"/api/recording/ws/{session_id}",
             status="recording"
         )
@@ -155,6 +179,7 @@ async def start_recording(
 @router.post("/recording/stop", response_model=StopRecordingResponse)
 async def stop_recording(
     request: StopRecordingRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -163,22 +188,25 @@ async def stop_recording(
 
     - Closes WebSocket connection
     - Updates Meeting status to 'completed'
-    - Triggers transcription processing
+    - Saves the transcript and schedules AI summary generation
     """
     try:
-        # Get the meeting
-        meeting = db.query(Meeting).filter(
+        # Get the meeting and its transcription in one query
+        row = db.query(Meeting, Transcription).outerjoin(
+            Transcription, Transcription.id == Meeting.transcription_id
+        ).filter(
             and_(
                 Meeting.id == request.meeting_id,
                 Meeting.user_id == current_user.id
             )
         ).first()
 
-        if not meeting:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Meeting not found"
             )
+        meeting, transcription = row
 
         if meeting.recording_status != "recording":
             raise HTTPException(
@@ -196,79 +224,55 @@ async def stop_recording(
         if meeting.actual_start_time and meeting.actual_end_time:
             duration_seconds = int((meeting.actual_end_time - meeting.actual_start_time).total_seconds())
 
-        # Get transcription
-        transcription = db.query(Transcription).filter(
-            Transcription.id == meeting.transcription_id
-        ).first()
-
-        # Get session data before removing it
+        # Take the session out of the store; its buffers are released once
+        # the transcript is joined, not after the commit
         session_id = str(meeting.transcription_id)
-        transcript_chunks = []
-        if session_id in active_sessions:
-            transcript_chunks = active_sessions[session_id].get("transcript_chunks", [])
+        session = active_sessions.pop(session_id, None)
+        transcript_texts = session["transcript_texts"] if session else []
+        transcript_confidences = session["transcript_confidences"] if session else array("f")
 
         if transcription:
             transcription.duration_seconds = duration_seconds
 
             # Combine all transcript chunks into final transcript
-            if transcript_chunks:
-                full_transcript = "\n".join([chunk["text"] for chunk in transcript_chunks])
-                transcription.transcription_text = full_transcript
+            if transcript_texts:
+                # Joined once; the column value is the only copy kept from here on
+                transcription.transcription_text = "\n".join(transcript_texts)
                 transcription.status = "completed"
 
                 # Calculate average confidence
-                if transcript_chunks:
-                    avg_confidence = sum(chunk.get("confidence", 0) for chunk in transcript_chunks) / len(transcript_chunks)
+                if transcript_confidences:
+                    avg_confidence = sum(transcript_confidences) / len(transcript_confidences)
                     transcription.confidence_score = avg_confidence
 
-                logger.info(f"Saved transcript for meeting {meeting.id}: {len(full_transcript)} characters")
+                transcript_texts.clear()
+
+                logger.info(f"Saved transcript for meeting {meeting.id}: {len(transcription.transcription_text)} characters")
             else:
                 # No transcript generated
                 transcription.status = "completed"
                 transcription.transcription_text = ""
 
-        # Generate AI summary if we have transcript
-        if transcript_chunks and transcription and transcription.transcription_text:
-            try:
-                from app.services.groq_service import GroqService
-                groq_service = GroqService()
-
-                # Generate summary
-                summary_prompt = f"""Generate a concise meeting summary from this transcript. Include:
-1. Key Discussion Points (3-5 bullet points)
-2. Decisions Made
-3. Next Steps
-
-Transcript:
-{transcription.transcription_text[:4000]}  # Limit to avoid token limits
-"""
-
-                summary = await groq_service.generate_summary(summary_prompt)
-
-                # Update transcription with summary
-                if summary:
-                    transcription.summary_text = summary
-                    meeting.summary = summary  # Also save to meeting
-                    logger.info(f"Generated AI summary for meeting {meeting.id}")
+        # Read before commit expires the instances
+        meeting_id = str(meeting.id)
+        transcription_id = str(meeting.transcription_id) if meeting.transcription_id else None
 
-            except Exception as e:
-                logger.error(f"Failed to generate summary: {e}")
-                # Don't fail the whole request if summary generation fails
-
-        # Update meeting summary status
-        meeting.recording_status = "completed"
+        # The AI summary is a multi-second LLM call, generate it after responding.
+        # recording_status stays "processing" until it is stored
+        if transcription and transcription.transcription_text:
+            background_tasks.add_task(
+                generate_recording_summary, meeting_id, transcription_id
+            )
+        else:
+            meeting.recording_status = "completed"
 
         db.commit()
 
-        # Remove from active sessions
-        if session_id in active_sessions:
-            del active_sessions[session_id]
-
-        logger.info(f"Stopped recording for meeting {meeting.id}")
+        logger.info(f"Stopped recording for meeting {meeting_id}")
 
         return StopRecordingResponse(
-            meeting_id=str(meeting.id),
-            transcription_id=str(meeting.transcription_id) if meeting.transcription_id else None,
+            meeting_id=meeting_id,
+            transcription_id=transcription_id,
             duration_seconds=duration_seconds,
             status="completed"
         )
@@ -283,6 +287,55 @@ Transcript:
         )
 
 
+async def generate_recording_summary(meeting_id: str, transcription_id: str):
+    """
+    Background task: summarize a stopped recording and mark the meeting completed
+
+    Opens its own session since the request's session is closed by the time it runs
+    """
+    db = SessionLocal()
+    try:
+        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+        transcription = db.query(Transcription).filter(
+            Transcription.id == transcription_id
+        ).first()
+        if not meeting or not transcription:
+            logger.error(f"Summary skipped, meeting {meeting_id} or transcription {transcription_id} not found")
+            return
+
+        try:
+            # generate_summary wraps the text in its own sectioned summary prompt;
+            # cap the transcript to avoid token limits
+            summary = await groq_service.generate_summary(
+                transcription.transcription_text[:4000]
+            )
+
+            # Update transcription with summary
+            if summary:
+                transcription.summary_text = summary
+                meeting.summary = summary  # Also save to meeting
+                logger.info(f"Generated AI summary for meeting {meeting.id}")
+
+        except Exception as e:
+            logger.error(f"Failed to generate summary: {e}")
+            # The recording itself is saved, a missing summary isn't fatal
+
+        # Update meeting summary status
+        meeting.recording_status = "completed"
+        user_id = transcription.user_id
+        db.commit()
+
+        # The transcription was already completed (and may have been cached)
+        # before the summary landed
+        await invalidate_transcription_cache(user_id, transcription_id)
+
+    except Exception as e:
+        logger.error(f"Summary task failed for meeting {meeting_id}: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
 @router.get("/recording/status/{meeting_id}")
 async def get_recording_status(
     meeting_id: str,
@@ -323,7 +376,7 @@ async def get_recording_status(
         # Add duration if recording
         if is_active and session_id:
             session = active_sessions[session_id]
-            duration = (datetime.utcnow() - session["started_at"]).total_seconds()
+            duration = time.monotonic() - session["started_monotonic"]
             response["duration_seconds"] = int(duration)
 
         return response
@@ -342,6 +395,106 @@ async def get_recording_status(
 # WebSocket for Real-time Audio Streaming
 # ========================================
 
+async def send_json_fast(websocket: WebSocket, message: dict):
+    """send_json encoded with orjson, still as a text frame since the client JSON.parses it"""
+    await websocket.send_text(orjson.dumps(message).decode())
+
+
+def _drop_oldest_audio(session: dict) -> int:
+    """
+    Shed the oldest queued frames until half of MAX_QUEUED_AUDIO_BYTES is free
+
+    Keeping the newest audio preserves continuity with what is being said now.
+
+    Returns:
+        Number of frames dropped
+    """
+    queue = session["audio_queue"]
+    dropped = 0
+    while session["queued_bytes"] > MAX_QUEUED_AUDIO_BYTES // 2 and not queue.empty():
+        session["queued_bytes"] -= len(queue.get_nowait())
+        dropped += 1
+    return dropped
+
+
+async def _transcribe_consumer(websocket: WebSocket, session_id: str, session: dict):
+    """
+    Drain a session's audio queue, transcribing every CHUNKS_PER_TRANSCRIPTION chunks
+
+    Runs as its own task so receiving audio never waits on Groq latency.
+    A None item ends the consumer.
+    """
+    queue = session["audio_queue"]
+    # References to the received frames; the audio is copied exactly once,
+    # by the join that builds the upload body
+    pending = []
+
+    while True:
+        audio_chunk = await queue.get()
+        if audio_chunk is None:
+            break
+        pending.append(audio_chunk)
+        session["queued_bytes"] -= len(audio_chunk)
+
+        # Take whatever else is already queued in the same wakeup rather than
+        # one scheduler round trip per frame (backlogs build while Groq is busy)
+        while len(pending) < CHUNKS_PER_TRANSCRIPTION and not queue.empty():
+            audio_chunk = queue.get_nowait()
+            if audio_chunk is None:
+                break
+            pending.append(audio_chunk)
+            session["queued_bytes"] -= len(audio_chunk)
+        if audio_chunk is None:
+            break
+
+        if len(pending) < CHUNKS_PER_TRANSCRIPTION:
+            continue
+
+        audio_data = b"".join(pending)
+        flushed_chunks = len(pending)
+        pending.clear()
+
+        # One receipt per flush instead of an ack for every audio frame
+        await send_json_fast(websocket, {
+            "type": "flush",
+            "chunks": flushed_chunks,
+            "bytes": len(audio_data)
+        })
+
+        try:
+            # Transcribe the audio buffer
+            result = await transcription_service.transcribe_chunk(
+                audio_data,
+                language="en"  # TODO: Get from meeting settings
+            )
+
+            # Only send if we got actual text
+            if result.get("text"):
+                # Send transcript to client
+                await send_json_fast(websocket, {
+                    "type": "transcript",
+                    "text": result["text"],
+                    "is_final": result.get("is_final", True),
+                    "confidence": result.get("confidence", 1.0),
+                    "language": result.get("language", "en"),
+                    "offset_ms": int((time.monotonic() - session["started_monotonic"]) * 1000)
+                })
+
+                # Store transcript chunk for final save
+                session["transcript_texts"].append(result["text"])
+                session["transcript_confidences"].append(result.get("confidence", 1.0))
+
+                logger.info(f"Transcribed chunk for session {session_id}: {len(result['text'])} chars")
+
+        except Exception as e:
+            logger.error(f"Error transcribing audio buffer: {e}")
+            # Don't stop the recording, just log the error
+            await send_json_fast(websocket, {
+                "type": "transcription_error",
+                "message": "Temporary transcription error, continuing recording..."
+            })
+
+
 @router.websocket("/recording/ws/{session_id}")
 async def recording_websocket(
     websocket: WebSocket,
@@ -359,7 +512,7 @@ async def recording_websocket(
 
     # Verify session exists
     if session_id not in active_sessions:
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "type": "error",
             "message": "Invalid session ID"
         })
@@ -367,92 +520,65 @@ async def recording_websocket(
         return
 
     session = active_sessions[session_id]
+    consumer = asyncio.create_task(_transcribe_consumer(websocket, session_id, session))
 
     try:
         # Send connection confirmation
-        await websocket.send_json({
+        await send_json_fast(websocket, {
             "type": "connected",
             "session_id": session_id,
             "message": "Recording session started"
         })
 
-        # Main message loop
+        # Main message loop. Control and audio frames share one ASGI receive
+        # channel, so they can't be split across iter_text()/iter_bytes() readers;
+        # audio is by far the most frequent, so it is checked first
         while True:
             # Receive message from client
             data = await websocket.receive()
 
-            # Handle different message types
-            if "text" in data:
+            audio_chunk = data.get("bytes")
+            if audio_chunk is not None:
+                # Binary audio data
+                # Bound per-session memory when transcription can't keep up
+                if session["queued_bytes"] + len(audio_chunk) > MAX_QUEUED_AUDIO_BYTES:
+                    dropped = _drop_oldest_audio(session)
+                    logger.warning(f"Session {session_id} audio backlog full, dropped {dropped} frames")
+                    await send_json_fast(websocket, {
+                        "type": "backpressure",
+                        "action": "slow_down",
+                        "dropped_chunks": dropped
+                    })
+
+                # Hand off to the consumer without waiting; the byte cap above
+                # bounds the queue, so control messages are never stuck behind it.
+                # Not acknowledged per chunk, the consumer reports each flush
+                session["queued_bytes"] += len(audio_chunk)
+                session["audio_queue"].put_nowait(audio_chunk)
+
+            elif data.get("text") is not None:
                 # JSON message (control messages)
-                message = json.loads(data["text"])
+                message = orjson.loads(data["text"])
                 message_type = message.get("type")
 
                 if message_type == "ping":
                     # Heartbeat
-                    await websocket.send_json({"type": "pong"})
+                    await send_json_fast(websocket, {"type": "pong"})
 
                 elif message_type == "stop":
-                    # Client requested stop
-                    await websocket.send_json({
+                    # Client requested stop, finish transcribing what is queued
+                    session["audio_queue"].put_nowait(None)
+                    await consumer
+                    await send_json_fast(websocket, {
                         "type": "stopped",
                         "message": "Recording stopped"
                     })
                     break
 
-            elif "bytes" in data:
-                # Binary audio data
-                audio_chunk = data["bytes"]
-
-                # Store audio chunk
-                session["audio_buffer"].append(audio_chunk)
-
-                # Acknowledge receipt
-                await websocket.send_json({
-                    "type": "audio_received",
-                    "chunk_size": len(audio_chunk),
-                    "total_chunks": len(session["audio_buffer"])
-                })
-
-                # Process audio buffer every 5 chunks (~5 seconds of audio)
-                if len(session["audio_buffer"]) >= 5:
-                    # Get buffer to process
-                    buffer_to_process = session["audio_buffer"].copy()
-                    session["audio_buffer"] = []  # Clear buffer
-
-                    try:
-                        # Transcribe the audio buffer
-                        result = await transcription_service.transcribe_buffer(
-                            buffer_to_process,
-                            language="en"  # TODO: Get from meeting settings
-                        )
-
-                        # Only send if we got actual text
-                        if result.get("text"):
-                            # Send transcript to client
-                            await websocket.send_json({
-                                "type": "transcript",
-                                "text": result["text"],
-                                "is_final": result.get("is_final", True),
-                                "confidence": result.get("confidence", 1.0),
-                                "language": result.get("language", "en")
-                            })
-
-                            # Store transcript chunk for final save
-                            session["transcript_chunks"].append({
-                                "text": result["text"],
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "confidence": result.get("confidence", 1.0)
-                            })
-
-                            logger.info(f"Transcribed chunk for session {session_id}: {len(result['text'])} chars")
-
-                    except Exception as e:
-                        logger.error(f"Error transcribing audio buffer: {e}")
-                        # Don't stop the recording, just log the error
-                        await websocket.send_json({
-                            "type": "transcription_error",
-                            "message": "Temporary transcription error, continuing recording..."
-                        })
+            elif data["type"] == "websocket.disconnect":
+                # receive() returns the disconnect instead of raising it
+                logger.info(f"WebSocket disconnected for session {session_id}")
+                break
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for session {session_id}")
@@ -462,7 +588,7 @@ async def recording_websocket(
         if "1005" not in error_str and "1000" not in error_str:
             logger.error(f"WebSocket error for session {session_id}: {e}")
             try:
-                await websocket.send_json({
+                await send_json_fast(websocket, {
                     "type": "error",
                     "message": str(e)
                 })
@@ -472,6 +598,8 @@ async def recording_websocket(
             logger.info(f"WebSocket closed normally for session {session_id}")
     finally:
         # Cleanup
+        if not consumer.done():
+            consumer.cancel()
         try:
             await websocket.close()
         except:
@@ -1,20 +1,38 @@
 # backend/app/routes/transcriptions.py - Enhanced with optional titles and export
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Response
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, HttpUrl
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, HttpUrl
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+import asyncio
 import logging
+import secrets
 import uuid
+import csv
 import json
 import io
+import tempfile
 from datetime import datetime
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import User, Transcription
-from ..services.auth_service import get_current_user
+from ..services.auth_service import get_current_user, get_current_user_async
 from ..services.transcription_service import TranscriptionService
+from ..services.cache_service import (
+    TRANSCRIPTION_CACHE_TTL_SECONDS,
+    cache_add_json,
+    cache_get_json,
+    get_redis,
+    invalidate_transcription_cache,
+    transcription_cache_key
+)
 from ..services.file_service import FileService
+from ..services.streaming_upload import stream_multipart_upload
 from ..config import settings
+from ..tasks import process_transcription
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -41,7 +59,22 @@ class TranscriptionText(BaseModel):
     generate_summary: bool = True
     add_to_knowledge_base: bool = True
 
+class DirectUploadRequest(BaseModel):
+    filename: str
+    content_type: str
+
+class DirectUploadFinalize(BaseModel):
+    storage_key: str
+    filename: str
+    title: Optional[str] = None
+    language: str = "auto"
+    generate_summary: bool = True
+    speaker_diarization: bool = False
+    add_to_knowledge_base: bool = True
+
 class TranscriptionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: str
     title: str
     status: str
@@ -59,8 +92,60 @@ class TranscriptionResponse(BaseModel):
     folder_id: Optional[str] = None
     tags: Optional[list] = []
 
+    @classmethod
+    def from_model(cls, t: Transcription) -> "TranscriptionResponse":
+        """Build from a Transcription row without re-validating trusted DB values"""
+        return cls.model_construct(
+            id=str(t.id),
+            title=t.title,
+            status=t.status,
+            file_type=t.file_type,
+            file_size=t.file_size,
+            duration_seconds=t.duration_seconds,
+            transcription_text=t.transcription_text,
+            summary_text=t.summary_text,
+            language=t.language,
+            created_at=t.created_at.isoformat(),
+            completed_at=t.completed_at.isoformat() if t.completed_at else None,
+            processing_time_seconds=t.processing_time_seconds,
+            error_message=t.error_message,
+            is_favorite=bool(t.is_favorite),
+            folder_id=str(t.folder_id) if t.folder_id else None,
+            tags=[]  # TODO: Load tags from junction table
+        )
+
+def transcription_json(
+    response: TranscriptionResponse,
+    status_code: int = status.HTTP_200_OK
+) -> ORJSONResponse:
+    """
+    Encode a TranscriptionResponse straight to JSON
+
+    Routes keep response_model for the schema, but returning a Response
+    makes FastAPI skip its dump-and-revalidate pass over a model we built
+    ourselves (and the decorator's status_code, hence the parameter).
+    """
+    return ORJSONResponse(response.model_dump(), status_code=status_code)
+
+class TranscriptionSummary(BaseModel):
+    """List view row: TranscriptionResponse without the transcript and summary text"""
+    id: str
+    title: str
+    status: str
+    file_type: Optional[str]
+    file_size: Optional[int]
+    duration_seconds: Optional[int]
+    language: str
+    created_at: str
+    completed_at: Optional[str]
+    processing_time_seconds: Optional[int]
+    error_message: Optional[str]
+    is_favorite: Optional[bool] = False
+    folder_id: Optional[str] = None
+    tags: Optional[list] = []
+
 class TranscriptionList(BaseModel):
-    transcriptions: List[TranscriptionResponse]
+    transcriptions: List[TranscriptionSummary]
     total: int
     page: int
     per_page: int
@@ -69,25 +154,67 @@ class TranscriptionList(BaseModel):
 transcription_service = TranscriptionService()
 file_service = FileService()
 
+# Monthly transcription limit per tier; tiers not listed (business) are unlimited
+_TIER_LIMITS = {
+    "free": settings.FREE_TIER_LIMIT,
+    "pro": settings.PRO_TIER_LIMIT,
+}
+
+_TIER_LIMIT_MESSAGES = {
+    "free": "Monthly limit exceeded. Upgrade to Pro for more transcriptions.",
+    "pro": "Monthly limit exceeded. Contact support for higher limits.",
+}
+
 def check_usage_limits(user: User, db: Session):
-    """Check if user has exceeded usage limits"""
-    if user.subscription_tier == "business":
-        return  # Unlimited for business tier
-    if user.subscription_tier == "free" and user.monthly_transcription_count >= settings.FREE_TIER_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_402_PAYMENT_REQUIRED,
-            detail=f"Monthly limit exceeded. Upgrade to Pro for more transcriptions."
-        )
-    elif user.subscription_tier == "pro" and user.monthly_transcription_count >= settings.PRO_TIER_LIMIT:
+    """
+    Check if user has exceeded usage limits
+
+    Reads the tier and count off the User row get_current_user already
+    loaded for this request, so the check itself issues no query. Keep it
+    that way rather than caching the count elsewhere: a copy would lag the
+    atomic increment in create_transcription_record.
+    """
+    limit = _TIER_LIMITS.get(user.subscription_tier)
+    if limit is not None and user.monthly_transcription_count >= limit:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
-            detail=f"Monthly limit exceeded. Contact support for higher limits."
+            detail=_TIER_LIMIT_MESSAGES[user.subscription_tier]
         )
 
-def increment_usage(user: User, db: Session):
-    """Increment user's monthly usage counter"""
-    user.monthly_transcription_count += 1
-    db.commit()
+async def create_transcription_record(db: AsyncSession, user: User, transcription: Transcription):
+    """
+    Insert a transcription and count it against the user's monthly usage
+    in a single transaction
+
+    The id and created_at are client-side defaults filled in by the flush, so
+    no refresh SELECT is needed, and the async session doesn't expire them on
+    commit.
+    """
+    db.add(transcription)
+    await db.flush()
+
+    # Atomic increment; no read-modify-write race between concurrent requests
+    await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(monthly_transcription_count=User.monthly_transcription_count + 1)
+    )
+
+    await db.commit()
+
+async def get_user_transcription(
+    db: AsyncSession,
+    transcription_id: str,
+    user_id: uuid.UUID
+) -> Optional[Transcription]:
+    """Load one of the user's transcriptions, or None if missing or not theirs"""
+    result = await db.execute(
+        select(Transcription).where(
+            Transcription.id == transcription_id,
+            Transcription.user_id == user_id
+        )
+    )
+    return result.scalar_one_or_none()
 
 # Enhanced background processing for routes/transcriptions.py
 
@@ -98,9 +225,14 @@ async def process_transcription_background(
 ):
     """Enhanced background task to process transcription with detailed logging"""
     db = None
+    transcription = None
     try:
         from ..database import SessionLocal
-        db = SessionLocal()
+        # Don't expire on commit: after the "processing" commit the pipeline
+        # only reads attributes it already has, so the connection goes back to
+        # the pool for the minutes of Whisper/LLM calls instead of sitting
+        # idle in a transaction opened by a reload
+        db = SessionLocal(expire_on_commit=False)
         
         # Convert string ID to UUID if needed
         if isinstance(transcription_id, str):
@@ -119,9 +251,19 @@ async def process_transcription_background(
         
         # Process based on type
         if processing_type == "file":
-            result = await transcription_service.process_file_transcription(
-                db, transcription, file_path_or_url_or_text
-            )
+            # The row's URL wins over the payload: a redelivered job finds the
+            # upload already archived to S3 and fetches it from there
+            file_url = transcription.file_url or file_path_or_url_or_text
+            # Spooled and local paths are returned as-is, S3 objects are fetched
+            local_file_path = await file_service.download_file(file_url)
+            try:
+                result = await transcription_service.process_file_transcription(
+                    db, transcription, local_file_path
+                )
+            finally:
+                if local_file_path != file_url:
+                    file_service.cleanup_temp_file(local_file_path)
+                await _archive_upload(db, transcription, file_url)
         elif processing_type == "url":
             result = await transcription_service.process_url_transcription(
                 db, transcription, file_path_or_url_or_text
@@ -150,7 +292,7 @@ async def process_transcription_background(
         logger.error(f"Error traceback:", exc_info=True)
         
         # Update transcription status to failed if we have access to it
-        if db and 'transcription' in locals():
+        if db and transcription:
             try:
                 transcription.status = "failed"
                 transcription.error_message = str(e)
@@ -163,47 +305,103 @@ async def process_transcription_background(
         if db:
             db.close()
 
+async def _archive_upload(db: Session, transcription: Transcription, file_url: str):
+    """Move a spooled upload to object storage once the job is done with it"""
+    if not file_service.is_spooled(file_url):
+        return
+
+    try:
+        transcription.file_url = await file_service.archive_spooled_file(
+            file_url, transcription.file_type
+        )
+        db.commit()
+    except Exception as e:
+        # The spool file stays put and the row keeps pointing at it
+        logger.error(f"Failed to archive upload {file_url}: {e}")
+        db.rollback()
+
+def enqueue_transcription(
+    background_tasks: BackgroundTasks,
+    transcription_id: str,
+    processing_type: str,
+    payload: str
+):
+    """Queue processing on the Celery workers when enabled, else run it in-process after the response"""
+    if settings.CELERY_ENABLED:
+        process_transcription.delay(transcription_id, processing_type, payload)
+    else:
+        background_tasks.add_task(
+            process_transcription_background, transcription_id, processing_type, payload
+        )
+
+def _form_bool(fields: dict, name: str, default: bool) -> bool:
+    """Parse a boolean form field the way FastAPI's Form(bool) would"""
+    value = fields.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "on", "yes")
+
 @router.post("/upload", response_model=TranscriptionResponse, status_code=status.HTTP_201_CREATED)
 async def upload_file_transcription(
+    request: Request,
     background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    title: Optional[str] = Form(None),  # Made optional
-    language: str = Form("auto"),
-    generate_summary: bool = Form(True),
-    speaker_diarization: bool = Form(False),
-    add_to_knowledge_base: bool = Form(True),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload and process audio/video file for transcription
+
+    Expects multipart/form-data with a `file` part and optional `title`,
+    `language`, `generate_summary`, `speaker_diarization` and
+    `add_to_knowledge_base` fields. The file is streamed to storage as it
+    arrives rather than spooled through an UploadFile first.
     """
     try:
-        # Check usage limits
+        # Check usage limits before accepting the body
         check_usage_limits(current_user, db)
-        
-        # Validate file
-        file_service.validate_file(file.filename, file.size, file.content_type)
-        
+
+        # The user lookup left a transaction open; hand the connection back
+        # for the (possibly minutes-long) client transfer. The session starts
+        # a new transaction for the insert, and current_user stays readable
+        await db.close()
+
+        def open_writer(filename: str, content_type: str):
+            # Size is enforced while streaming; validate name and type up front
+            file_service.validate_file(filename, 0, content_type)
+            return file_service.open_upload_writer(filename, content_type, str(current_user.id))
+
+        try:
+            upload = await stream_multipart_upload(request, open_writer, settings.MAX_FILE_SIZE)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if upload.file_url is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No file provided"
+            )
+
+        title = upload.fields.get("title")
+        language = upload.fields.get("language") or "auto"
+        generate_summary = _form_bool(upload.fields, "generate_summary", True)
+        speaker_diarization = _form_bool(upload.fields, "speaker_diarization", False)
+        add_to_knowledge_base = _form_bool(upload.fields, "add_to_knowledge_base", True)
+        file_url = upload.file_url
+
         # Generate auto title if not provided
         auto_title = title
         if not auto_title or auto_title.strip() == "":
-            auto_title = transcription_service.generate_auto_title(file_name=file.filename)
+            auto_title = transcription_service.generate_auto_title(file_name=upload.filename)
             logger.info(f"Auto-generated title: {auto_title}")
-        
-        # Upload file to storage
-        file_url = await file_service.upload_file(
-            file.file, file.filename, file.content_type, str(current_user.id)
-        )
-        
+
         # Create transcription record
         transcription = Transcription(
             user_id=current_user.id,
             title=auto_title,
-            original_filename=file.filename,
+            original_filename=upload.filename,
             file_url=file_url,
-            file_type=file.content_type,
-            file_size=file.size,
+            file_type=upload.content_type,
+            file_size=upload.size,
             language=language,
             generate_summary=generate_summary,
             speaker_diarization=speaker_diarization,
@@ -211,47 +409,153 @@ async def upload_file_transcription(
             status="pending"
         )
         
-        db.add(transcription)
-        db.commit()
-        db.refresh(transcription)
-        
-        # Increment usage
-        increment_usage(current_user, db)
-        
-        # Download file for processing
-        local_file_path = await file_service.download_file(file_url)
+        # Insert and increment usage in one transaction
+        await create_transcription_record(db, current_user, transcription)
         
         # Start background processing
-        background_tasks.add_task(
-            process_transcription_background,
+        enqueue_transcription(
+            background_tasks,
             str(transcription.id),
             "file",
-            local_file_path
+            file_url
         )
         
         logger.info(f"File transcription started: {transcription.id} with title: {transcription.title}")
         
-        return TranscriptionResponse(
-            id=str(transcription.id),
-            title=transcription.title,
-            status=transcription.status,
-            file_type=transcription.file_type,
-            file_size=transcription.file_size,
-            duration_seconds=transcription.duration_seconds,
-            transcription_text=transcription.transcription_text,
-            summary_text=transcription.summary_text,
-            language=transcription.language,
-            created_at=transcription.created_at.isoformat(),
-            completed_at=transcription.completed_at.isoformat() if transcription.completed_at else None,
-            processing_time_seconds=transcription.processing_time_seconds,
-            error_message=transcription.error_message
-        )
+        return transcription_json(TranscriptionResponse.from_model(transcription), status.HTTP_201_CREATED)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"File upload failed: {e}")
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="File upload failed"
+        )
+
+@router.post("/upload/presign")
+async def presign_direct_upload(
+    upload_request: DirectUploadRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a presigned S3 POST so the client uploads the file directly to
+    storage, then call /upload/finalize with the returned storage_key
+    """
+    try:
+        # Check usage limits
+        check_usage_limits(current_user, db)
+
+        # Size is enforced by the presigned policy
+        try:
+            file_service.validate_file(upload_request.filename, 0, upload_request.content_type)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if not file_service.use_s3:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Direct uploads require S3 storage, use /upload instead"
+            )
+
+        return file_service.generate_presigned_upload(
+            upload_request.filename, upload_request.content_type, str(current_user.id)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Presigning upload failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not prepare upload"
+        )
+
+@router.post("/upload/finalize", response_model=TranscriptionResponse, status_code=status.HTTP_201_CREATED)
+async def finalize_direct_upload(
+    background_tasks: BackgroundTasks,
+    finalize_data: DirectUploadFinalize,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create the transcription for a file uploaded through /upload/presign
+    """
+    try:
+        # Check usage limits
+        check_usage_limits(current_user, db)
+
+        if not file_service.use_s3:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Direct uploads require S3 storage, use /upload instead"
+            )
+
+        # Keys are issued under the user's prefix; refuse anyone else's object
+        if not finalize_data.storage_key.startswith(f"{current_user.id}/"):
+            raise HTTPException(status_code=404, detail="Upload not found")
+
+        file_url = file_service.storage_url(finalize_data.storage_key)
+
+        already_finalized = await db.scalar(
+            select(Transcription.id).where(
+                Transcription.user_id == current_user.id,
+                Transcription.file_url == file_url
+            ).limit(1)
+        )
+        if already_finalized:
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+
+        # Don't sit idle in a transaction across the S3 round trip
+        await db.close()
+
+        file_info = await file_service.get_file_info(file_url)
+        if not file_info:
+            raise HTTPException(status_code=404, detail="Upload not found")
+
+        # Generate auto title if not provided
+        auto_title = finalize_data.title
+        if not auto_title or auto_title.strip() == "":
+            auto_title = transcription_service.generate_auto_title(file_name=finalize_data.filename)
+            logger.info(f"Auto-generated title: {auto_title}")
+
+        # Create transcription record
+        transcription = Transcription(
+            user_id=current_user.id,
+            title=auto_title,
+            original_filename=finalize_data.filename,
+            file_url=file_url,
+            file_type=file_info.get('content_type'),
+            file_size=file_info['size'],
+            language=finalize_data.language,
+            generate_summary=finalize_data.generate_summary,
+            speaker_diarization=finalize_data.speaker_diarization,
+            add_to_knowledge_base=finalize_data.add_to_knowledge_base,
+            status="pending"
+        )
+
+        # Insert and increment usage in one transaction
+        await create_transcription_record(db, current_user, transcription)
+
+        # Start background processing
+        enqueue_transcription(
+            background_tasks,
+            str(transcription.id),
+            "file",
+            file_url
+        )
+
+        logger.info(f"Direct upload transcription started: {transcription.id} with title: {transcription.title}")
+
+        return transcription_json(TranscriptionResponse.from_model(transcription), status.HTTP_201_CREATED)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Finalizing direct upload failed: {e}")
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="File upload failed"
@@ -261,8 +565,8 @@ async def upload_file_transcription(
 async def create_url_transcription(
     background_tasks: BackgroundTasks,
     transcription_data: TranscriptionURL,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Process URL (YouTube, podcast, any video/audio URL) for transcription
@@ -290,16 +594,12 @@ async def create_url_transcription(
             status="pending"
         )
         
-        db.add(transcription)
-        db.commit()
-        db.refresh(transcription)
-        
-        # Increment usage
-        increment_usage(current_user, db)
+        # Insert and increment usage in one transaction
+        await create_transcription_record(db, current_user, transcription)
         
         # Start background processing
-        background_tasks.add_task(
-            process_transcription_background,
+        enqueue_transcription(
+            background_tasks,
             str(transcription.id),
             "url",
             str(transcription_data.url)
@@ -307,27 +607,13 @@ async def create_url_transcription(
         
         logger.info(f"URL transcription started: {transcription.id} with URL: {transcription_data.url}")
         
-        return TranscriptionResponse(
-            id=str(transcription.id),
-            title=transcription.title,
-            status=transcription.status,
-            file_type=transcription.file_type,
-            file_size=transcription.file_size,
-            duration_seconds=transcription.duration_seconds,
-            transcription_text=transcription.transcription_text,
-            summary_text=transcription.summary_text,
-            language=transcription.language,
-            created_at=transcription.created_at.isoformat(),
-            completed_at=transcription.completed_at.isoformat() if transcription.completed_at else None,
-            processing_time_seconds=transcription.processing_time_seconds,
-            error_message=transcription.error_message
-        )
+        return transcription_json(TranscriptionResponse.from_model(transcription), status.HTTP_201_CREATED)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"URL transcription failed: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="URL transcription failed"
@@ -337,8 +623,8 @@ async def create_url_transcription(
 async def create_text_transcription(
     background_tasks: BackgroundTasks,
     transcription_data: TranscriptionText,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Process uploaded text for summary and knowledge base
@@ -363,16 +649,12 @@ async def create_text_transcription(
             status="pending"
         )
         
-        db.add(transcription)
-        db.commit()
-        db.refresh(transcription)
-        
-        # Increment usage
-        increment_usage(current_user, db)
+        # Insert and increment usage in one transaction
+        await create_transcription_record(db, current_user, transcription)
         
         # Start background processing
-        background_tasks.add_task(
-            process_transcription_background,
+        enqueue_transcription(
+            background_tasks,
             str(transcription.id),
             "text",
             transcription_data.text
@@ -380,27 +662,18 @@ async def create_text_transcription(
         
         logger.info(f"Text processing started: {transcription.id} with title: {transcription.title}")
         
-        return TranscriptionResponse(
-            id=str(transcription.id),
-            title=transcription.title,
-            status=transcription.status,
-            file_type=transcription.file_type,
-            file_size=len(transcription_data.text.encode('utf-8')),
-            duration_seconds=0,
-            transcription_text=None,  # Will be set after processing
-            summary_text=None,  # Will be set after processing
-            language="auto",
-            created_at=transcription.created_at.isoformat(),
-            completed_at=None,
-            processing_time_seconds=None,
-            error_message=None
-        )
+        # Text and summary are filled in after processing
+        response = TranscriptionResponse.from_model(transcription).model_copy(update={
+            "file_size": len(transcription_data.text.encode('utf-8')),
+            "duration_seconds": 0
+        })
+        return transcription_json(response, status.HTTP_201_CREATED)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Text processing failed: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Text processing failed"
@@ -412,8 +685,8 @@ async def export_transcription(
     transcription_id: str,
     format: str = "txt",  # txt, json, pdf, srt, docx, csv
     content: str = "both",  # transcription, summary, both
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Export transcription and/or summary in various formats
@@ -421,10 +694,7 @@ async def export_transcription(
     Content options: transcription, summary, both
     """
     try:
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id,
-            Transcription.user_id == current_user.id
-        ).first()
+        transcription = await get_user_transcription(db, transcription_id, current_user.id)
         
         if not transcription:
             raise HTTPException(status_code=404, detail="Transcription not found")
@@ -434,6 +704,10 @@ async def export_transcription(
                 status_code=400, 
                 detail="Transcription is not completed yet"
             )
+
+        # Every column is loaded; release the connection before rendering,
+        # which can take seconds for long PDF/DOCX documents
+        await db.close()
         
         # Prepare content based on user selection
         transcription_text = transcription.transcription_text or ""
@@ -462,7 +736,7 @@ async def export_transcription(
             return _export_as_json(transcription, content, base_filename)
         
         elif format == "pdf":
-            return _export_as_pdf(transcription, main_content, content_title, base_filename)
+            return await _export_as_pdf(transcription, main_content, content_title, base_filename)
         
         elif format == "srt":
             if content == "summary":
@@ -470,7 +744,7 @@ async def export_transcription(
             return _export_as_srt(transcription_text, base_filename)
         
         elif format == "docx":
-            return _export_as_docx(transcription, main_content, content_title, base_filename)
+            return await _export_as_docx(transcription, main_content, content_title, base_filename)
         
         elif format == "csv":
             return _export_as_csv(transcription, base_filename)
@@ -522,68 +796,114 @@ def _export_as_json(transcription: Transcription, content_type: str, filename: s
         headers={"Content-Disposition": f"attachment; filename={filename}.json"}
     )
 
-def _export_as_pdf(transcription: Transcription, content: str, content_title: str, filename: str) -> Response:
+# Rendered documents stay in memory up to this size, then spill to disk
+EXPORT_SPOOL_MAX_SIZE = 1 << 20
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+
+def _iter_spool(spool: BinaryIO) -> Iterator[bytes]:
+    """Yield a rendered export in fixed-size chunks, closing the spool when done"""
+    try:
+        spool.seek(0)
+        yield from iter(lambda: spool.read(EXPORT_STREAM_CHUNK_SIZE), b"")
+    finally:
+        spool.close()
+
+def _iter_csv(rows: Iterable[list]) -> Iterator[str]:
+    """Serialize CSV one row at a time so the document never fully materializes"""
+    line = io.StringIO()
+    writer = csv.writer(line)
+    for row in rows:
+        writer.writerow(row)
+        yield line.getvalue()
+        line.seek(0)
+        line.truncate()
+
+def _render_pdf(
+    out: BinaryIO,
+    title: str,
+    created_at: datetime,
+    language: str,
+    duration_seconds: Optional[int],
+    content: str,
+    content_title: str
+) -> None:
+    """Build the PDF document into out; pure CPU work, so callers run it in a thread"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.units import inch
+
+    doc = SimpleDocTemplate(out, pagesize=A4, topMargin=1*inch)
+
+    # Get styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=30,
+    )
+
+    # Build content
+    story = []
+
+    # Title
+    story.append(Paragraph(title, title_style))
+    story.append(Spacer(1, 12))
+
+    # Metadata
+    metadata = [
+        f"<b>Content Type:</b> {content_title}",
+        f"<b>Created:</b> {created_at.strftime('%Y-%m-%d %H:%M')}",
+        f"<b>Language:</b> {language}",
+    ]
+
+    if duration_seconds:
+        duration_min = duration_seconds // 60
+        duration_sec = duration_seconds % 60
+        metadata.append(f"<b>Duration:</b> {duration_min}:{duration_sec:02d}")
+
+    for meta in metadata:
+        story.append(Paragraph(meta, styles['Normal']))
+
+    story.append(Spacer(1, 20))
+
+    # Content
+    paragraphs = content.split('\n\n')
+    for para in paragraphs:
+        if para.strip():
+            story.append(Paragraph(para.strip(), styles['Normal']))
+            story.append(Spacer(1, 12))
+
+    doc.build(story)
+
+async def _export_as_pdf(transcription: Transcription, content: str, content_title: str, filename: str) -> Response:
     """Export as PDF with formatting"""
     try:
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-        from reportlab.lib.units import inch
-        
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            spaceAfter=30,
-        )
-        
-        # Build content
-        story = []
-        
-        # Title
-        story.append(Paragraph(transcription.title, title_style))
-        story.append(Spacer(1, 12))
-        
-        # Metadata
-        metadata = [
-            f"<b>Content Type:</b> {content_title}",
-            f"<b>Created:</b> {transcription.created_at.strftime('%Y-%m-%d %H:%M')}",
-            f"<b>Language:</b> {transcription.language}",
-        ]
-        
-        if transcription.duration_seconds:
-            duration_min = transcription.duration_seconds // 60
-            duration_sec = transcription.duration_seconds % 60
-            metadata.append(f"<b>Duration:</b> {duration_min}:{duration_sec:02d}")
-        
-        for meta in metadata:
-            story.append(Paragraph(meta, styles['Normal']))
-        
-        story.append(Spacer(1, 20))
-        
-        # Content
-        paragraphs = content.split('\n\n')
-        for para in paragraphs:
-            if para.strip():
-                story.append(Paragraph(para.strip(), styles['Normal']))
-                story.append(Spacer(1, 12))
-        
-        doc.build(story)
-        pdf_content = buffer.getvalue()
-        buffer.close()
-        
-        return Response(
-            content=pdf_content,
+        # Layout of long transcripts takes seconds; keep it off the event loop.
+        # Plain values only, the ORM object stays on this thread
+        spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        try:
+            await run_in_threadpool(
+                _render_pdf,
+                spool,
+                transcription.title,
+                transcription.created_at,
+                transcription.language,
+                transcription.duration_seconds,
+                content,
+                content_title
+            )
+        except BaseException:
+            spool.close()
+            raise
+
+        return StreamingResponse(
+            _iter_spool(spool),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}.pdf"}
         )
-        
+
     except ImportError:
         # Fallback if reportlab not available
         raise HTTPException(
@@ -591,90 +911,103 @@ def _export_as_pdf(transcription: Transcription, content: str, content_title: st
             detail="PDF export requires reportlab package: pip install reportlab"
         )
 
+SRT_WORDS_PER_CUE = 12
+SRT_SECONDS_PER_CUE = 4
+
 def _export_as_srt(text: str, filename: str) -> Response:
     """Export as SRT subtitle format"""
     if not text:
         raise HTTPException(status_code=400, detail="No transcription text available")
     
-    # Split text into chunks (roughly 10-15 words per subtitle)
+    # Split text into chunks (12 words per subtitle, 4 seconds each)
     words = text.split()
-    chunks = []
-    current_chunk = []
-    
-    for word in words:
-        current_chunk.append(word)
-        if len(current_chunk) >= 12:  # 12 words per subtitle
-            chunks.append(' '.join(current_chunk))
-            current_chunk = []
-    
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
-    
-    # Generate SRT format
-    srt_content = ""
-    for i, chunk in enumerate(chunks, 1):
-        start_time = (i - 1) * 4  # 4 seconds per subtitle
-        end_time = i * 4
-        
-        start_formatted = format_srt_time(start_time)
-        end_formatted = format_srt_time(end_time)
-        
-        srt_content += f"{i}\n"
-        srt_content += f"{start_formatted} --> {end_formatted}\n"
-        srt_content += f"{chunk}\n\n"
-    
+    chunks = [
+        ' '.join(words[i:i + SRT_WORDS_PER_CUE])
+        for i in range(0, len(words), SRT_WORDS_PER_CUE)
+    ]
+
+    # Generate SRT format with a single join instead of repeated +=
+    srt_content = ''.join([
+        f"{i}\n{format_srt_time((i - 1) * SRT_SECONDS_PER_CUE)} --> "
+        f"{format_srt_time(i * SRT_SECONDS_PER_CUE)}\n{chunk}\n\n"
+        for i, chunk in enumerate(chunks, 1)
+    ])
+
     return Response(
         content=srt_content,
         media_type="text/plain",
         headers={"Content-Disposition": f"attachment; filename={filename}.srt"}
     )
 
-def _export_as_docx(transcription: Transcription, content: str, content_title: str, filename: str) -> Response:
+def _render_docx(
+    out: BinaryIO,
+    title: str,
+    created_at: datetime,
+    language: str,
+    duration_seconds: Optional[int],
+    content: str,
+    content_title: str
+) -> None:
+    """Build the DOCX document into out; pure CPU work, so callers run it in a thread"""
+    from docx import Document
+
+    doc = Document()
+
+    # Title
+    doc.add_heading(title, 0)
+
+    # Metadata table
+    table = doc.add_table(rows=1, cols=2)
+    table.style = 'Table Grid'
+
+    metadata_items = [
+        ("Content Type", content_title),
+        ("Created", created_at.strftime('%Y-%m-%d %H:%M')),
+        ("Language", language),
+    ]
+
+    if duration_seconds:
+        duration_min = duration_seconds // 60
+        duration_sec = duration_seconds % 60
+        metadata_items.append(("Duration", f"{duration_min}:{duration_sec:02d}"))
+
+    for key, value in metadata_items:
+        row_cells = table.add_row().cells
+        row_cells[0].text = key
+        row_cells[1].text = str(value)
+
+    # Content
+    doc.add_heading(content_title, level=1)
+
+    paragraphs = content.split('\n\n')
+    for para in paragraphs:
+        if para.strip():
+            doc.add_paragraph(para.strip())
+
+    doc.save(out)
+
+async def _export_as_docx(transcription: Transcription, content: str, content_title: str, filename: str) -> Response:
     """Export as DOCX document"""
     try:
-        from docx import Document
-        from docx.shared import Inches
-        
-        doc = Document()
-        
-        # Title
-        title = doc.add_heading(transcription.title, 0)
-        
-        # Metadata table
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Table Grid'
-        
-        metadata_items = [
-            ("Content Type", content_title),
-            ("Created", transcription.created_at.strftime('%Y-%m-%d %H:%M')),
-            ("Language", transcription.language),
-        ]
-        
-        if transcription.duration_seconds:
-            duration_min = transcription.duration_seconds // 60
-            duration_sec = transcription.duration_seconds % 60
-            metadata_items.append(("Duration", f"{duration_min}:{duration_sec:02d}"))
-        
-        for key, value in metadata_items:
-            row_cells = table.add_row().cells
-            row_cells[0].text = key
-            row_cells[1].text = str(value)
-        
-        # Content
-        doc.add_heading(content_title, level=1)
-        
-        paragraphs = content.split('\n\n')
-        for para in paragraphs:
-            if para.strip():
-                doc.add_paragraph(para.strip())
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
+        # Same as the PDF export: render off the event loop from plain values
+        spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+        try:
+            await run_in_threadpool(
+                _render_docx,
+                spool,
+                transcription.title,
+                transcription.created_at,
+                transcription.language,
+                transcription.duration_seconds,
+                content,
+                content_title
+            )
+        except BaseException:
+            spool.close()
+            raise
         
-        return Response(
-            content=buffer.getvalue(),
+        return StreamingResponse(
+            _iter_spool(spool),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={"Content-Disposition": f"attachment; filename={filename}.docx"}
         )
@@ -687,19 +1020,12 @@ def _export_as_docx(transcription: Transcription, content: str, content_title: s
 
 def _export_as_csv(transcription: Transcription, filename: str) -> Response:
     """Export metadata and content as CSV"""
-    import csv
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Headers
-    writer.writerow([
+    headers = [
         "ID", "Title", "Created", "Completed", "Duration (seconds)", 
         "Language", "File Type", "Status", "Transcription", "Summary"
-    ])
+    ]
     
-    # Data
-    writer.writerow([
+    row = [
         str(transcription.id),
         transcription.title,
         transcription.created_at.isoformat(),
@@ -710,56 +1036,51 @@ def _export_as_csv(transcription: Transcription, filename: str) -> Response:
         transcription.status,
         transcription.transcription_text or "",
         transcription.summary_text or ""
-    ])
-    
-    csv_content = output.getvalue()
-    output.close()
+    ]
     
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        _iter_csv([headers, row]),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}.csv"}
     )
 
 def format_srt_time(seconds: int) -> str:
     """Format seconds into SRT time format (HH:MM:SS,mmm)"""
-    hours = seconds // 3600
-    minutes = (seconds % 3600) // 60
-    secs = seconds % 60
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},000"
 
+SHARE_LINK_TTL_SECONDS = 7 * 24 * 3600
+
+def share_cache_key(share_token: str) -> str:
+    return f"share:{share_token}"
+
 @router.post("/{transcription_id}/share")
 async def create_shareable_link(
     transcription_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a shareable public link for transcription
     """
     try:
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id,
-            Transcription.user_id == current_user.id
-        ).first()
+        transcription = await get_user_transcription(db, transcription_id, current_user.id)
         
         if not transcription:
             raise HTTPException(status_code=404, detail="Transcription not found")
         
-        # Generate a unique share token
-        import secrets
+        # Generate a unique share token and keep it in Redis, which expires it
         share_token = secrets.token_urlsafe(32)
-        
-        # Store share token in database (you might want to add a shares table)
-        # For now, we'll use a simple approach
+        await get_redis().set(
+            share_cache_key(share_token), str(transcription.id), ex=SHARE_LINK_TTL_SECONDS
+        )
+
         share_url = f"{settings.FRONTEND_URL}/share/{share_token}"
-        
-        # You could store this in Redis or a shares table
-        # For demo purposes, we'll return a basic share URL
-        
+
         return {
             "share_url": share_url,
-            "expires_at": "7 days"  # You can implement expiration
+            "expires_at": "7 days"
         }
         
     except HTTPException:
@@ -768,66 +1089,119 @@ async def create_shareable_link(
         logger.error(f"Share link creation failed: {e}")
         raise HTTPException(status_code=500, detail="Share link creation failed")
 
+@router.get("/share/{share_token}", response_model=TranscriptionResponse)
+async def get_shared_transcription(
+    share_token: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Resolve a share link created by /{transcription_id}/share (no login needed)
+    """
+    try:
+        transcription_id = await get_redis().get(share_cache_key(share_token))
+        if transcription_id is None:
+            raise HTTPException(status_code=404, detail="Share link not found or expired")
+
+        transcription = await db.get(Transcription, uuid.UUID(transcription_id))
+        if not transcription:
+            raise HTTPException(status_code=404, detail="Share link not found or expired")
+
+        return transcription_json(TranscriptionResponse.from_model(transcription))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Share link lookup failed: {e}")
+        raise HTTPException(status_code=500, detail="Share link lookup failed")
+
 @router.get("/", response_model=TranscriptionList)
 async def list_transcriptions(
     page: int = 1,
     per_page: int = 20,
     status_filter: Optional[str] = None,
     source_type: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List user's transcriptions with pagination
     """
     try:
-        # Build query
-        query = db.query(Transcription).filter(Transcription.user_id == current_user.id)
+        # Build query over the list columns only; the text columns can be
+        # megabytes per row. count(*) OVER () carries the filtered total on
+        # every row, so the page and the total come back in one round trip
+        stmt = select(
+            Transcription.id,
+            Transcription.title,
+            Transcription.status,
+            Transcription.file_type,
+            Transcription.file_size,
+            Transcription.duration_seconds,
+            Transcription.language,
+            Transcription.created_at,
+            Transcription.completed_at,
+            Transcription.processing_time_seconds,
+            Transcription.error_message,
+            Transcription.is_favorite,
+            Transcription.folder_id,
+            func.count().over().label("total")
+        ).where(Transcription.user_id == current_user.id)
 
         if status_filter:
-            query = query.filter(Transcription.status == status_filter)
+            stmt = stmt.where(Transcription.status == status_filter)
 
         if source_type:
-            query = query.filter(Transcription.source_type == source_type)
-        
-        # Get total count
-        total = query.count()
-        
+            stmt = stmt.where(Transcription.source_type == source_type)
+
         # Apply pagination
         offset = (page - 1) * per_page
-        transcriptions = query.order_by(
-            Transcription.created_at.desc()
-        ).offset(offset).limit(per_page).all()
-        
+        rows = (await db.execute(
+            stmt.order_by(Transcription.created_at.desc()).offset(offset).limit(per_page)
+        )).all()
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page the window has no rows to ride on
+            total = await db.scalar(
+                select(func.count()).select_from(
+                    stmt.with_only_columns(Transcription.id).subquery()
+                )
+            )
+        else:
+            total = 0
+
         # Convert to response format
-        transcription_list = []
-        for t in transcriptions:
-            transcription_list.append(TranscriptionResponse(
-                id=str(t.id),
-                title=t.title,
-                status=t.status,
-                file_type=t.file_type,
-                file_size=t.file_size,
-                duration_seconds=t.duration_seconds,
-                transcription_text=t.transcription_text,
-                summary_text=t.summary_text,
-                language=t.language,
-                created_at=t.created_at.isoformat(),
-                completed_at=t.completed_at.isoformat() if t.completed_at else None,
-                processing_time_seconds=t.processing_time_seconds,
-                error_message=t.error_message,
-                is_favorite=t.is_favorite if hasattr(t, 'is_favorite') else False,
-                folder_id=str(t.folder_id) if t.folder_id else None,
-                tags=[]  # TODO: Load tags from junction table
-            ))
-        
-        return TranscriptionList(
-            transcriptions=transcription_list,
-            total=total,
-            page=page,
-            per_page=per_page
-        )
-        
+        # Hot path: build plain dicts and let orjson encode them (it handles
+        # UUID and datetime natively), skipping outbound model validation.
+        # The shape matches TranscriptionList, which stays the documented model
+        transcription_list = [
+            {
+                "id": t.id,
+                "title": t.title,
+                "status": t.status,
+                "file_type": t.file_type,
+                "file_size": t.file_size,
+                "duration_seconds": t.duration_seconds,
+                "language": t.language,
+                "created_at": t.created_at,
+                "completed_at": t.completed_at,
+                "processing_time_seconds": t.processing_time_seconds,
+                "error_message": t.error_message,
+                "is_favorite": bool(t.is_favorite),
+                "folder_id": t.folder_id,
+                "tags": []  # TODO: Load tags from junction table
+            }
+            for t in rows
+        ]
+
+        return ORJSONResponse({
+            "transcriptions": transcription_list,
+            "total": total,
+            "page": page,
+            "per_page": per_page
+        })
+
     except Exception as e:
         logger.error(f"Failed to list transcriptions: {e}")
         raise HTTPException(
@@ -838,17 +1212,30 @@ async def list_transcriptions(
 @router.get("/{transcription_id}", response_model=TranscriptionResponse)
 async def get_transcription(
     transcription_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get specific transcription details
     """
     try:
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id,
-            Transcription.user_id == current_user.id
-        ).first()
+        try:
+            transcription_uuid = uuid.UUID(transcription_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Transcription not found"
+            )
+
+        # Completed transcriptions only change via PATCH, DELETE, folder moves or
+        # a late recording summary, all of which invalidate the entry, so serve
+        # from Redis
+        cache_key = transcription_cache_key(current_user.id, transcription_uuid)
+        cached = await cache_get_json(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
+
+        transcription = await get_user_transcription(db, transcription_uuid, current_user.id)
         
         if not transcription:
             raise HTTPException(
@@ -856,21 +1243,13 @@ async def get_transcription(
                 detail="Transcription not found"
             )
         
-        return TranscriptionResponse(
-            id=str(transcription.id),
-            title=transcription.title,
-            status=transcription.status,
-            file_type=transcription.file_type,
-            file_size=transcription.file_size,
-            duration_seconds=transcription.duration_seconds,
-            transcription_text=transcription.transcription_text,
-            summary_text=transcription.summary_text,
-            language=transcription.language,
-            created_at=transcription.created_at.isoformat(),
-            completed_at=transcription.completed_at.isoformat() if transcription.completed_at else None,
-            processing_time_seconds=transcription.processing_time_seconds,
-            error_message=transcription.error_message
-        )
+        response = TranscriptionResponse.from_model(transcription)
+        if transcription.status == "completed":
+            # NX: a write that landed after this read has left a tombstone,
+            # which this (possibly stale) snapshot must not replace
+            await cache_add_json(cache_key, response.model_dump(mode="json"), TRANSCRIPTION_CACHE_TTL_SECONDS)
+
+        return transcription_json(response)
         
     except HTTPException:
         raise
@@ -884,40 +1263,45 @@ async def get_transcription(
 @router.delete("/{transcription_id}")
 async def delete_transcription(
     transcription_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete transcription and associated data
     """
     try:
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id,
-            Transcription.user_id == current_user.id
-        ).first()
-        
-        if not transcription:
+        # One statement deletes the row and returns what is left to clean up.
+        # Chunk vectors and tag links go with it (ON DELETE CASCADE)
+        deleted = (await db.execute(
+            delete(Transcription)
+            .where(
+                Transcription.id == transcription_id,
+                Transcription.user_id == current_user.id
+            )
+            .returning(Transcription.id, Transcription.file_url)
+        )).one_or_none()
+
+        if deleted is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Transcription not found"
             )
-        
-        # Delete from vector database if exists
-        try:
-            from app.services.knowledge_service import KnowledgeService
-            knowledge_service = KnowledgeService(db)
-            await knowledge_service.delete_transcription_vectors(transcription.id)
-            logger.info(f"Deleted vector embeddings for transcription {transcription_id}")
-        except Exception as e:
-            logger.warning(f"Failed to delete vector embeddings: {e}")
-        
+
+        await db.commit()
+
+        # The cascade bypassed KnowledgeService, so drop its cached stats;
+        # Redis and the file store are independent, clean both up at once
+        from app.services.knowledge_service import invalidate_kb_stats_cache
+        cleanups = [
+            invalidate_kb_stats_cache(current_user.id),
+            invalidate_transcription_cache(current_user.id, deleted.id)
+        ]
+
         # Delete file from storage if exists
-        if transcription.file_url and not transcription.file_url.startswith('http'):
-            await file_service.delete_file(transcription.file_url)
-        
-        # Delete transcription record
-        db.delete(transcription)
-        db.commit()
+        if deleted.file_url and not deleted.file_url.startswith('http'):
+            cleanups.append(file_service.delete_file(deleted.file_url))
+
+        await asyncio.gather(*cleanups)
         
         logger.info(f"Transcription deleted: {transcription_id}")
         return {"message": "Transcription deleted successfully"}
@@ -926,7 +1310,7 @@ async def delete_transcription(
         raise
     except Exception as e:
         logger.error(f"Failed to delete transcription {transcription_id}: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete transcription"
@@ -941,8 +1325,8 @@ async def create_realtime_transcription(
     language: str = Form("auto"),
     generate_summary: bool = Form(True),
     add_to_knowledge_base: bool = Form(True),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Process realtime audio recording for transcription
@@ -971,12 +1355,8 @@ async def create_realtime_transcription(
             status="pending"
         )
         
-        db.add(transcription)
-        db.commit()
-        db.refresh(transcription)
-        
-        # Increment usage
-        increment_usage(current_user, db)
+        # Insert and increment usage in one transaction
+        await create_transcription_record(db, current_user, transcription)
         
         # Save audio file temporarily
         import tempfile
@@ -987,7 +1367,8 @@ async def create_realtime_transcription(
             temp_file.write(content)
             temp_path = temp_file.name
         
-        # Start background processing
+        # Start background processing. Always in-process: the recording is a
+        # local temp file a Celery worker on another machine couldn't read
         background_tasks.add_task(
             process_transcription_background,
             str(transcription.id),
@@ -997,27 +1378,13 @@ async def create_realtime_transcription(
         
         logger.info(f"Realtime transcription started: {transcription.id} with title: {transcription.title}")
         
-        return TranscriptionResponse(
-            id=str(transcription.id),
-            title=transcription.title,
-            status=transcription.status,
-            file_type=transcription.file_type,
-            file_size=transcription.file_size,
-            duration_seconds=transcription.duration_seconds,
-            transcription_text=transcription.transcription_text,
-            summary_text=transcription.summary_text,
-            language=transcription.language,
-            created_at=transcription.created_at.isoformat(),
-            completed_at=transcription.completed_at.isoformat() if transcription.completed_at else None,
-            processing_time_seconds=transcription.processing_time_seconds,
-            error_message=transcription.error_message
-        )
+        return transcription_json(TranscriptionResponse.from_model(transcription), status.HTTP_201_CREATED)
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Realtime transcription failed: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Realtime transcription failed"
@@ -1029,23 +1396,25 @@ async def bulk_export_transcriptions(
     format: str = "json",  # json, csv, zip
     content: str = "both",  # transcription, summary, both
     status_filter: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Export multiple transcriptions in bulk
     """
     try:
         # Get user's transcriptions
-        query = db.query(Transcription).filter(
+        query = select(Transcription).where(
             Transcription.user_id == current_user.id,
             Transcription.status == "completed"
         )
         
         if status_filter:
-            query = query.filter(Transcription.status == status_filter)
+            query = query.where(Transcription.status == status_filter)
         
-        transcriptions = query.order_by(Transcription.created_at.desc()).all()
+        transcriptions = (
+            await db.scalars(query.order_by(Transcription.created_at.desc()))
+        ).all()
         
         if not transcriptions:
             raise HTTPException(status_code=404, detail="No completed transcriptions found")
@@ -1105,12 +1474,7 @@ def _bulk_export_json(transcriptions: List[Transcription], content_type: str) ->
     )
 
 def _bulk_export_csv(transcriptions: List[Transcription], content_type: str) -> Response:
-    """Export all transcriptions as CSV"""
-    import csv
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
+    """Export all transcriptions as CSV, streamed row by row"""
     # Headers
     headers = [
         "ID", "Title", "Created", "Completed", "Duration (seconds)", 
@@ -1123,38 +1487,38 @@ def _bulk_export_csv(transcriptions: List[Transcription], content_type: str) ->
     if content_type in ["summary", "both"]:
         headers.append("Summary")
     
-    writer.writerow(headers)
-    
-    # Data
-    for t in transcriptions:
-        row = [
-            str(t.id),
-            t.title,
-            t.created_at.isoformat(),
-            t.completed_at.isoformat() if t.completed_at else "",
-            t.duration_seconds or "",
-            t.language,
-            t.file_type or "",
-            t.status
-        ]
-        
-        if content_type in ["transcription", "both"]:
-            row.append(t.transcription_text or "")
-        
-        if content_type in ["summary", "both"]:
-            row.append(t.summary_text or "")
-        
-        writer.writerow(row)
-    
-    csv_content = output.getvalue()
-    output.close()
+    def rows():
+        yield headers
+        for t in transcriptions:
+            yield _bulk_csv_row(t, content_type)
     
-    return Response(
-        content=csv_content,
+    return StreamingResponse(
+        _iter_csv(rows()),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename=bulk_export_{content_type}.csv"}
     )
 
+def _bulk_csv_row(t: Transcription, content_type: str) -> list:
+    """One bulk CSV row for a transcription"""
+    row = [
+        str(t.id),
+        t.title,
+        t.created_at.isoformat(),
+        t.completed_at.isoformat() if t.completed_at else "",
+        t.duration_seconds or "",
+        t.language,
+        t.file_type or "",
+        t.status
+    ]
+    
+    if content_type in ["transcription", "both"]:
+        row.append(t.transcription_text or "")
+    
+    if content_type in ["summary", "both"]:
+        row.append(t.summary_text or "")
+    
+    return row
+
 def _bulk_export_zip(transcriptions: List[Transcription], content_type: str) -> Response:
     """Export all transcriptions as individual text files in a ZIP"""
     import zipfile
@@ -1620,15 +1984,12 @@ class TranscriptionUpdate(BaseModel):
 async def update_transcription(
     transcription_id: str,
     update: TranscriptionUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update transcription properties (favorite, folder)"""
     try:
-        transcription = db.query(Transcription).filter(
-            Transcription.id == transcription_id,
-            Transcription.user_id == current_user.id
-        ).first()
+        transcription = await get_user_transcription(db, transcription_id, current_user.id)
 
         if not transcription:
             raise HTTPException(status_code=404, detail="Transcription not found")
@@ -1640,14 +2001,14 @@ async def update_transcription(
         if update.folder_id is not None:
             transcription.folder_id = update.folder_id
 
-        db.commit()
-        db.refresh(transcription)
+        await db.commit()
+        await invalidate_transcription_cache(current_user.id, transcription.id)
 
         return {"message": "Transcription updated successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to update transcription: {e}")
         raise HTTPException(status_code=500, detail="Failed to update transcription")
\ No newline at end of file
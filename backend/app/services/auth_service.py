@@ -5,8 +5,10 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import User
 from ..config import settings
 import logging
@@ -66,26 +68,24 @@ class AuthService:
             return None
         return user
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get current authenticated user
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _token_email(credentials: HTTPAuthorizationCredentials) -> str:
+    """Email claim of a valid bearer token, 401 otherwise"""
     token_data = AuthService.verify_token(credentials.credentials)
     if token_data is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == token_data["email"]).first()
+        raise _credentials_exception()
+    return token_data["email"]
+
+def _ensure_active(user: Optional[User]) -> User:
+    """401 for an unknown user, 403 for a disabled one"""
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     if not user.is_active:
         raise HTTPException(
@@ -95,6 +95,32 @@ def get_current_user(
     
     return user
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get current authenticated user
+    """
+    email = _token_email(credentials)
+    user = db.query(User).filter(User.email == email).first()
+    return _ensure_active(user)
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    Dependency to get current authenticated user on the async session
+
+    For routes that use get_async_db: FastAPI caches the dependency per
+    request, so the lookup shares the route's session and connection instead
+    of checking one out from the sync pool as well.
+    """
+    email = _token_email(credentials)
+    user = await db.scalar(select(User).where(User.email == email).limit(1))
+    return _ensure_active(user)
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
     Dependency to get current active user
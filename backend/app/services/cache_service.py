@@ -0,0 +1,120 @@
+"""
+Cache Service
+Thin Redis wrapper for short-lived per-user values (stats, tuning params)
+Degrades to a no-op cache when Redis is unavailable
+"""
+import json
+import logging
+from typing import Any, Optional
+from uuid import UUID
+
+import redis.asyncio as aioredis
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Completed transcriptions only change through PATCH/DELETE, folder moves and
+# late recording summaries, each of which invalidates the affected keys
+TRANSCRIPTION_CACHE_TTL_SECONDS = 3600
+
+# Invalidation leaves a short-lived tombstone instead of deleting the key, so
+# a GET that read the row before the write can't re-cache the old snapshot
+TRANSCRIPTION_CACHE_TOMBSTONE_SECONDS = 30
+
+
+# Global Redis client (created lazily, shared across requests)
+_redis_client: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Get or create the global async Redis client"""
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+        logger.info("Global Redis cache client created")
+
+    return _redis_client
+
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """
+    Read a JSON value from the cache
+
+    Returns:
+        Decoded value, or None on a miss or if Redis is unreachable
+    """
+    try:
+        raw = await get_redis().get(key)
+    except Exception as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+    return json.loads(raw) if raw is not None else None
+
+
+async def cache_set_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """Write a JSON-serializable value to the cache with a TTL"""
+    try:
+        await get_redis().set(key, json.dumps(value), ex=ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete one or more cache keys"""
+    if not keys:
+        return
+    try:
+        await get_redis().delete(*keys)
+    except Exception as e:
+        logger.warning(f"Cache delete failed for {keys}: {e}")
+
+
+async def cache_add_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """Write a JSON value only if the key is absent (SET NX), never overwriting"""
+    try:
+        await get_redis().set(key, json.dumps(value), ex=ttl_seconds, nx=True)
+    except Exception as e:
+        logger.warning(f"Cache add failed for {key}: {e}")
+
+
+def transcription_cache_key(user_id, transcription_id) -> str:
+    """
+    Key for a cached GET /transcriptions/{id} response
+
+    The id is normalized so every spelling of a UUID maps to the same key
+
+    Raises:
+        ValueError: If transcription_id is not a UUID
+    """
+    return f"txn:v1:{user_id}:{UUID(str(transcription_id))}"
+
+
+async def invalidate_transcription_cache(user_id, *transcription_ids) -> None:
+    """
+    Replace cached transcriptions with tombstones after a write
+
+    A tombstone reads as a miss (JSON null) and blocks cache_add_json fills
+    until it expires, so only reads that start after the write repopulate it.
+    """
+    if not transcription_ids:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for transcription_id in transcription_ids:
+                pipe.set(
+                    transcription_cache_key(user_id, transcription_id),
+                    "null",
+                    ex=TRANSCRIPTION_CACHE_TOMBSTONE_SECONDS
+                )
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for transcriptions {transcription_ids}: {e}")
@@ -0,0 +1,157 @@
+"""
+Embedding Service
+Shared SentenceTransformer model plus a micro-batcher that coalesces
+concurrent query encodes into a single forward pass
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+# Global model instance (loaded lazily, shared by every KnowledgeService)
+_embedding_model: Optional[SentenceTransformer] = None
+
+
+def _embedding_device() -> str:
+    """Resolve EMBEDDING_DEVICE, "auto" meaning CUDA when a GPU is visible"""
+    if settings.EMBEDDING_DEVICE != "auto":
+        return settings.EMBEDDING_DEVICE
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def get_embedding_model() -> SentenceTransformer:
+    """Get or load the global embedding model"""
+    global _embedding_model
+
+    if _embedding_model is None:
+        device = _embedding_device()
+        backend = settings.EMBEDDING_BACKEND
+        logger.info(f"Loading SentenceTransformer model on {device} ({backend})...")
+
+        model_kwargs = {}
+        if backend == "onnx" and settings.EMBEDDING_ONNX_FILE:
+            # Pre-quantized int8 export shipped with the model repo
+            model_kwargs["file_name"] = settings.EMBEDDING_ONNX_FILE
+
+        _embedding_model = SentenceTransformer(
+            EMBEDDING_MODEL_NAME,
+            device=device,
+            backend=backend,
+            model_kwargs=model_kwargs or None
+        )
+
+        if device.startswith("cuda") and backend == "torch":
+            # FP16 on GPU; embeddings are stored as halfvec anyway
+            _embedding_model.half()
+
+        logger.info("✅ SentenceTransformer model loaded")
+
+    return _embedding_model
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent encode() calls into micro-batches
+
+    A background task waits for the first pending text, then keeps draining
+    the queue until max_batch_size texts are collected or max_wait_ms elapses,
+    and encodes the whole batch in one model call off the event loop.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 20.0):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"Embedding batcher initialized: "
+            f"batch size {max_batch_size}, window {max_wait_ms}ms"
+        )
+
+    async def encode(self, text: str) -> np.ndarray:
+        """
+        Encode a single text, sharing the forward pass with concurrent callers
+
+        Returns:
+            L2-normalized embedding as a float32 numpy array
+        """
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    def _ensure_worker(self):
+        """Start the background batching task on first use"""
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """Block for one item, then gather more until the batch or window is full"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Background loop: collect a batch, encode it, resolve the futures"""
+        while True:
+            batch = await self._collect_batch()
+            texts = [text for text, _ in batch]
+
+            try:
+                # encode() sorts by length internally so padding is per-batch max.
+                # Unit-length output lets the search rank by inner product
+                embeddings = await asyncio.to_thread(
+                    get_embedding_model().encode,
+                    texts,
+                    batch_size=len(texts),
+                    normalize_embeddings=True
+                )
+            except Exception as e:
+                logger.error(f"Batch embedding failed for {len(texts)} texts: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+# Global batcher instance
+_embedding_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get or create the global embedding batcher"""
+    global _embedding_batcher
+
+    if _embedding_batcher is None:
+        _embedding_batcher = EmbeddingBatcher()
+
+    return _embedding_batcher
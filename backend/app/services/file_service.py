@@ -1,17 +1,50 @@
 # backend/app/services/file_service.py
+import asyncio
 import os
 import boto3
+from boto3.s3.transfer import TransferConfig
 import uuid
 from typing import Optional, BinaryIO
 from botocore.exceptions import ClientError
 import logging
 import tempfile
 import shutil
+from pathlib import Path
 
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+S3_PART_SIZE = 8 * 1024 * 1024
+
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_PART_SIZE,
+    multipart_chunksize=S3_PART_SIZE,
+    use_threads=True
+)
+
+
+class LocalUploadWriter:
+    """Incremental writer for an upload stored on local disk"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self._file = open(file_path, 'wb')
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def complete(self) -> str:
+        self._file.close()
+        logger.info(f"File uploaded locally: {self.file_path}")
+        return self.file_path
+
+    def abort(self):
+        self._file.close()
+        Path(self.file_path).unlink(missing_ok=True)
+
+
 class FileService:
     def __init__(self):
         self.use_s3 = bool(settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY)
@@ -24,6 +57,10 @@ class FileService:
                 region_name=settings.AWS_REGION
             )
             self.bucket_name = settings.AWS_BUCKET_NAME
+            # Uploads land here first and move to S3 once processed; the
+            # directory is shared with the workers (uploads volume)
+            self.spool_path = os.path.join(os.getcwd(), "uploads", "spool")
+            os.makedirs(self.spool_path, exist_ok=True)
         else:
             # Use local storage
             self.local_storage_path = os.path.join(os.getcwd(), "uploads")
@@ -53,6 +90,99 @@ class FileService:
             logger.error(f"File upload failed: {e}")
             raise RuntimeError(f"File upload failed: {str(e)}")
     
+    def open_upload_writer(self, filename: str, content_type: str, user_id: str):
+        """
+        Start an incremental upload for a file whose size is not known yet
+
+        With S3 configured the file is spooled to local disk, where the
+        transcription job reads it directly; archive_spooled_file moves it to
+        S3 afterwards, so the media never makes an upload-download round trip.
+
+        Returns:
+            Writer with write(bytes), complete() -> file URL and abort().
+            Its methods block, so call them off the event loop
+        """
+        file_extension = os.path.splitext(filename)[1]
+        unique_filename = f"{user_id}/{uuid.uuid4()}{file_extension}"
+
+        base_path = self.spool_path if self.use_s3 else self.local_storage_path
+        return LocalUploadWriter(os.path.join(base_path, unique_filename))
+
+    def generate_presigned_upload(
+        self,
+        filename: str,
+        content_type: str,
+        user_id: str,
+        expires_in: int = 900
+    ) -> dict:
+        """
+        Presign a browser POST straight to S3 for a new upload
+
+        S3 enforces the size limit and content type, so the API never
+        touches the media bytes.
+
+        Returns:
+            Dict with the form url, the fields to post with the file and
+            the storage key to hand back when finalizing
+        """
+        if not self.use_s3:
+            raise RuntimeError("Direct uploads require S3 storage")
+
+        file_extension = os.path.splitext(filename)[1]
+        storage_key = f"{user_id}/{uuid.uuid4()}{file_extension}"
+
+        presigned = self.s3_client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=storage_key,
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, settings.MAX_FILE_SIZE]
+            ],
+            ExpiresIn=expires_in
+        )
+
+        return {
+            'url': presigned['url'],
+            'fields': presigned['fields'],
+            'storage_key': storage_key
+        }
+
+    def storage_url(self, storage_key: str) -> str:
+        """File URL for an object key in the upload bucket"""
+        return f"s3://{self.bucket_name}/{storage_key}"
+
+    def is_spooled(self, file_url: str) -> bool:
+        """Whether file_url is a local spool file still waiting to move to S3"""
+        return self.use_s3 and file_url.startswith(self.spool_path + os.sep)
+
+    async def archive_spooled_file(self, file_path: str, content_type: Optional[str]) -> str:
+        """
+        Move a spooled upload to S3 and remove the local copy
+
+        Returns:
+            The S3 URL, or file_path unchanged if it is not a spool file
+        """
+        if not self.is_spooled(file_path):
+            return file_path
+
+        key = os.path.relpath(file_path, self.spool_path).replace(os.sep, '/')
+        await asyncio.to_thread(
+            self.s3_client.upload_file,
+            file_path,
+            self.bucket_name,
+            key,
+            ExtraArgs={
+                'ContentType': content_type or 'application/octet-stream',
+                'ACL': 'private'
+            },
+            Config=S3_TRANSFER_CONFIG
+        )
+        Path(file_path).unlink(missing_ok=True)
+
+        logger.info(f"Spooled upload archived to S3: {key}")
+        return f"s3://{self.bucket_name}/{key}"
+
     async def _upload_to_s3(self, file: BinaryIO, filename: str, content_type: str) -> str:
         """Upload file to S3"""
         try:
@@ -124,8 +254,16 @@ class FileService:
             temp_file = tempfile.NamedTemporaryFile(delete=False)
             temp_file.close()
             
-            # Download from S3
-            self.s3_client.download_file(bucket, key, temp_file.name)
+            # Download from S3. boto3's transfer manager already fetches large
+            # objects as parallel ranged GETs on its own threads; running it in
+            # a worker thread keeps the blocking call off the event loop
+            await asyncio.to_thread(
+                self.s3_client.download_file,
+                bucket,
+                key,
+                temp_file.name,
+                Config=S3_TRANSFER_CONFIG
+            )
             
             logger.info(f"File downloaded from S3: {key}")
             return temp_file.name
@@ -162,7 +300,7 @@ class FileService:
             key = parts[1]
             
             # Delete from S3
-            self.s3_client.delete_object(Bucket=bucket, Key=key)
+            await asyncio.to_thread(self.s3_client.delete_object, Bucket=bucket, Key=key)
             
             logger.info(f"File deleted from S3: {key}")
             return True
@@ -202,7 +340,7 @@ class FileService:
             key = parts[1]
             
             # Get object metadata
-            response = self.s3_client.head_object(Bucket=bucket, Key=key)
+            response = await asyncio.to_thread(self.s3_client.head_object, Bucket=bucket, Key=key)
             
             return {
                 'size': response['ContentLength'],
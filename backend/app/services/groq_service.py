@@ -2,7 +2,8 @@
 import os
 import tempfile
 import logging
-from groq import Groq
+from groq import AsyncGroq, Groq
+from .http_client import get_http_client
 from .rate_limiter import get_groq_rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,8 @@ class GroqTranscriptionService:
 
     def __init__(self, api_key: str):
         self.client = Groq(api_key=api_key)
+        # Chat completions go through the shared keep-alive HTTP pool
+        self.async_client = AsyncGroq(api_key=api_key, http_client=get_http_client())
         self.rate_limiter = get_groq_rate_limiter()
         logger.info("Groq service initialized with rate limiting")
 
@@ -107,7 +110,7 @@ class GroqTranscriptionService:
                 Keep it concise but comprehensive.
                 """
 
-                response = self.client.chat.completions.create(
+                response = await self.async_client.chat.completions.create(
                     model="meta-llama/llama-4-scout-17b-16e-instruct",
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=max_tokens,
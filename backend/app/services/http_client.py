@@ -0,0 +1,59 @@
+"""
+Shared HTTP Clients
+One pooled httpx.AsyncClient (HTTP/2, keep-alive) reused by outbound API calls,
+so real-time chunks don't pay a TLS handshake per request
+"""
+import logging
+from typing import Optional
+
+import httpx
+from groq import AsyncGroq
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Global HTTP client (created lazily, closed on application shutdown)
+_http_client: Optional[httpx.AsyncClient] = None
+_async_groq_client: Optional[AsyncGroq] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the global pooled async HTTP client"""
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        logger.info("Global HTTP client created")
+
+    return _http_client
+
+
+def get_async_groq_client() -> AsyncGroq:
+    """Get or create the global async Groq client on the shared HTTP pool"""
+    global _async_groq_client
+
+    if _async_groq_client is None:
+        _async_groq_client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            http_client=get_http_client()
+        )
+
+    return _async_groq_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (application shutdown)"""
+    global _http_client, _async_groq_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        logger.info("Global HTTP client closed")
+
+    _http_client = None
+    _async_groq_client = None
@@ -4,18 +4,121 @@ This is the updated knowledge service that uses Supabase pgvector instead of Qdr
 Replace the existing knowledge_service.py with this after migration.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import text, func
-from sentence_transformers import SentenceTransformer
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, func, tuple_, select, delete
+import numpy as np
 import os
 from groq import Groq
 from ..config import settings
 import logging
 logger = logging.getLogger(__name__)
 from app.models import KnowledgeQuery, Transcription, TranscriptionChunk
+from app.pagination import encode_cursor, decode_cursor
+from .cache_service import cache_get_json, cache_set_json, cache_delete
+from .embedding_service import get_embedding_model, get_embedding_batcher
+
+# Size of the HNSW candidate list explored per query (pgvector default is 40).
+# Must be >= the LIMIT of the search, higher values trade latency for recall.
+HNSW_EF_SEARCH = 100
+
+# Per-user HNSW parameter choice is cached for an hour to avoid a COUNT per search
+HNSW_PARAMS_CACHE_TTL_SECONDS = 3600
+
+# The user filter drops most ANN candidates in a shared index, so the candidate
+# list is widened to a multiple of the LIMIT. The smaller a user's share of the
+# index, the more candidates the filter throws away, so small libraries get the
+# widest multiplier (see configure_hnsw_params)
+HNSW_FILTERED_EF_MULTIPLIERS = (
+    (10_000, 40),
+    (100_000, 20),
+)
+HNSW_FILTERED_EF_MULTIPLIER = 10
+
+# pgvector rejects hnsw.ef_search outside 1..1000
+HNSW_MAX_EF_SEARCH = 1000
+
+# Knowledge base stats change far less often than they are polled
+KB_STATS_CACHE_TTL_SECONDS = 60
+
+# Chunk rows removed per DELETE when clearing a knowledge base, keeps each
+# transaction (and its WAL) bounded for users with very large libraries
+CLEAR_CHUNKS_BATCH_SIZE = 10000
+
+
+@lru_cache(maxsize=None)
+def chunk_search_sql(with_folder: bool, with_source_type: bool):
+    """
+    Chunk similarity search statement for a combination of optional filters
+
+    Only four variants exist, so each is built once and reused: the identical
+    SQL string hits SQLAlchemy's compiled cache and asyncpg's per-connection
+    prepared statement cache instead of being re-parsed and planned.
+    """
+    folder_filter = "AND t.folder_id = :folder_id" if with_folder else ""
+    source_type_filter = "AND t.source_type = :source_type" if with_source_type else ""
+
+    # Search using pgvector (cosine similarity)
+    # Chunk and query embeddings are unit length, so cosine similarity equals
+    # the inner product; <#> returns the negated inner product
+    # Note: We use CAST(:query_embedding AS halfvec) to avoid :: syntax issues with SQLAlchemy
+    # and to match the FP16 chunk column so the HNSW index is used
+    return text(f"""
+        SELECT
+            tc.id,
+            tc.transcription_id,
+            tc.text,
+            tc.chunk_index,
+            COALESCE(t.title, t.filename, 'Untitled') as display_title,
+            t.created_at,
+            -1 * (tc.embedding <#> CAST(:query_embedding AS halfvec)) as similarity
+        FROM transcription_chunks tc
+        JOIN transcriptions t ON t.id = tc.transcription_id
+        WHERE tc.user_id = :user_id
+          AND tc.embedding IS NOT NULL  -- matches the partial HNSW index predicate
+          AND -1 * (tc.embedding <#> CAST(:query_embedding AS halfvec)) > :threshold
+          {folder_filter}
+          {source_type_filter}
+        ORDER BY tc.embedding <#> CAST(:query_embedding AS halfvec)
+        LIMIT :limit
+    """)
+
+
+def kb_stats_cache_key(user_id: UUID) -> str:
+    return f"kb_stats:{user_id}"
+
+
+def kb_debug_cache_key(user_id: UUID) -> str:
+    return f"kb_debug:{user_id}"
+
+
+async def invalidate_kb_stats_cache(user_id: UUID) -> None:
+    """Drop cached stats/debug status after the user's knowledge base changed"""
+    await cache_delete(kb_stats_cache_key(user_id), kb_debug_cache_key(user_id))
+
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, Any]:
+    """
+    Pick the ef_search multiplier for a user's filtered search.
+
+    The HNSW index is shared by all users, so its build parameters (m,
+    ef_construction) are fixed by the migration; only the candidate list
+    can be tuned per search.
+
+    Args:
+        vector_count: Number of chunk embeddings the user has
+
+    Returns:
+        Dict with the ef_multiplier to apply to the search LIMIT
+    """
+    for max_vectors, multiplier in HNSW_FILTERED_EF_MULTIPLIERS:
+        if vector_count < max_vectors:
+            return {"ef_multiplier": multiplier}
+    return {"ef_multiplier": HNSW_FILTERED_EF_MULTIPLIER}
 
 class KnowledgeService:
     """
@@ -23,10 +126,8 @@ class KnowledgeService:
     Replaces Qdrant-based implementation.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        # Lazy-load embedding model only when needed (performance optimization)
-        self._model = None
 
         # Initialize Groq client if API key is available
         try:
@@ -40,12 +141,55 @@ class KnowledgeService:
 
     @property
     def model(self):
-        """Lazy-load the embedding model only when needed"""
-        if self._model is None:
-            logger.info("Loading SentenceTransformer model...")
-            self._model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("✅ SentenceTransformer model loaded")
-        return self._model
+        """Shared embedding model, loaded once per process on first use"""
+        return get_embedding_model()
+
+    async def encode_query(self, query_text: str) -> np.ndarray:
+        """
+        Encode a search query, batched with other in-flight queries.
+
+        The float32 array is bound directly as a query parameter, the pgvector
+        adapter registered on the engine handles serialization.
+        """
+        return await get_embedding_batcher().encode(query_text)
+
+    async def set_hnsw_ef_search(self, ef_search: int = HNSW_EF_SEARCH) -> None:
+        """
+        Set hnsw.ef_search for the current transaction so the next
+        similarity search uses idx_chunks_embedding_hnsw with enough recall.
+        Also enables hnsw.iterative_scan when HNSW_ITERATIVE_SCAN is configured.
+        """
+        await self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+
+        if settings.HNSW_ITERATIVE_SCAN:
+            await self.db.execute(
+                text("SELECT set_config('hnsw.iterative_scan', :mode, true)"),
+                {"mode": settings.HNSW_ITERATIVE_SCAN}
+            )
+
+    async def apply_hnsw_params(self, user_id: UUID, limit: int) -> Dict[str, Any]:
+        """
+        Tune hnsw.ef_search for this user's search based on their vector count.
+
+        Args:
+            user_id: User's UUID
+            limit: Number of results the search will return
+
+        Returns:
+            The HNSW parameters that were applied
+        """
+        cache_key = f"hnsw_params:v2:{user_id}"
+        params = await cache_get_json(cache_key)
+        if params is None:
+            params = configure_hnsw_params(await self._count_user_vectors(user_id))
+            await cache_set_json(cache_key, params, HNSW_PARAMS_CACHE_TTL_SECONDS)
+
+        # The user filter runs after the index probe, a candidate list near
+        # LIMIT would silently return fewer than LIMIT rows
+        await self.set_hnsw_ef_search(
+            min(limit * params["ef_multiplier"], HNSW_MAX_EF_SEARCH)
+        )
+        return params
 
     async def query_knowledge_base(
         self,
@@ -72,49 +216,27 @@ class KnowledgeService:
         """
 
         # Generate query embedding
-        query_embedding = self.model.encode(query_text).tolist()
-        vector_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
+        query_embedding = await self.encode_query(query_text)
 
-        # Build query with optional folder and source_type filters
-        folder_filter = ""
-        source_type_filter = ""
         params = {
-            "query_embedding": vector_str,
+            "query_embedding": query_embedding,
             "user_id": str(user_id),
             "threshold": similarity_threshold,
             "limit": limit
         }
 
         if folder_id:
-            folder_filter = "AND t.folder_id = :folder_id"
             params["folder_id"] = folder_id
 
         if source_type:
-            source_type_filter = "AND t.source_type = :source_type"
             params["source_type"] = source_type
 
-        # Search using pgvector (cosine similarity)
-        # Uses <=> operator for cosine distance (1 - similarity)
-        # Note: We use CAST(:query_embedding AS vector) to avoid :: syntax issues with SQLAlchemy
-        results = self.db.execute(text(f"""
-            SELECT
-                tc.id,
-                tc.transcription_id,
-                tc.text,
-                tc.chunk_index,
-                COALESCE(t.title, t.filename, 'Untitled') as display_title,
-                t.created_at,
-                1 - (tc.embedding <=> CAST(:query_embedding AS vector)) as similarity
-            FROM transcription_chunks tc
-            JOIN transcriptions t ON t.id = tc.transcription_id
-            WHERE t.user_id = :user_id
-              AND tc.embedding IS NOT NULL
-              AND 1 - (tc.embedding <=> CAST(:query_embedding AS vector)) > :threshold
-              {folder_filter}
-              {source_type_filter}
-            ORDER BY tc.embedding <=> CAST(:query_embedding AS vector)
-            LIMIT :limit
-        """), params).fetchall()
+        await self.apply_hnsw_params(user_id, limit)
+
+        result = await self.db.execute(
+            chunk_search_sql(bool(folder_id), bool(source_type)), params
+        )
+        results = result.fetchall()
 
         # Format sources
         sources = []
@@ -146,12 +268,12 @@ class KnowledgeService:
             user_id=user_id,
             query_text=query_text,
             response_text=answer,
-            transcription_ids=[s["transcription_id"] for s in sources],
+            transcription_ids=[UUID(s["transcription_id"]) for s in sources],
             confidence_score=confidence
         )
         self.db.add(query_record)
-        self.db.commit()
-        self.db.refresh(query_record)
+        await self.db.commit()
+        await invalidate_kb_stats_cache(user_id)
 
         return {
             "answer": answer,
@@ -163,7 +285,7 @@ class KnowledgeService:
     async def store_transcription(
         self,
         transcription_id: UUID,
-        text: str,
+        content: str,
         user_id: UUID,
         summary: Optional[str] = None
     ) -> int:
@@ -172,7 +294,7 @@ class KnowledgeService:
 
         Args:
             transcription_id: Transcription UUID
-            text: Full transcription text
+            content: Full transcription text
             user_id: User's UUID
             summary: Optional summary text
 
@@ -181,43 +303,75 @@ class KnowledgeService:
         """
 
         # Split text into chunks
-        chunks = self._split_text(text, chunk_size=1000)
-
-        # Generate embeddings and store chunks
-        for i, chunk_text in enumerate(chunks):
-            # Generate embedding for chunk
-            embedding = self.model.encode(chunk_text).tolist()
-            vector_str = "[" + ",".join(str(v) for v in embedding) + "]"
-
-            # Insert chunk with embedding
-            self.db.execute(text("""
-                INSERT INTO transcription_chunks
-                (transcription_id, chunk_index, text, embedding)
-                VALUES (:transcription_id, :chunk_index, :text, :embedding::vector)
-            """), {
-                "transcription_id": str(transcription_id),
-                "chunk_index": i,
-                "text": chunk_text,
-                "embedding": vector_str
-            })
+        chunks = self._split_text(content, chunk_size=1000)
 
-        # Also store full transcription embedding (optional, for whole-doc search)
-        full_embedding = self.model.encode(text[:5000]).tolist()  # Limit to first 5k chars
-        full_vector_str = "[" + ",".join(str(v) for v in full_embedding) + "]"
+        # Embed all chunks plus the whole-document text (first 5k chars, for
+        # whole-doc search) in one batched forward pass off the event loop,
+        # normalized once here so searches can use the cheaper inner product operator
+        embeddings = await asyncio.to_thread(
+            self.model.encode, chunks + [content[:5000]], normalize_embeddings=True
+        )
+        chunk_embeddings, full_embedding = embeddings[:-1], embeddings[-1]
+
+        # Store all chunks in one COPY round trip
+        await self.insert_chunks(transcription_id, user_id, chunks, chunk_embeddings)
 
-        self.db.execute(text("""
+        await self.db.execute(text("""
             UPDATE transcriptions
-            SET embedding = :embedding::vector
+            SET embedding = CAST(:embedding AS halfvec)
             WHERE id = :transcription_id
         """), {
             "transcription_id": str(transcription_id),
-            "embedding": full_vector_str
+            "embedding": full_embedding
         })
 
-        self.db.commit()
+        await self.db.commit()
+        await invalidate_kb_stats_cache(user_id)
 
         return len(chunks)
 
+    async def insert_chunks(
+        self,
+        transcription_id: UUID,
+        user_id: UUID,
+        chunks: List[str],
+        embeddings: Any
+    ) -> int:
+        """
+        Bulk-load chunks and their embeddings with binary COPY.
+
+        Runs inside the session's current transaction, the caller commits.
+
+        Args:
+            transcription_id: Transcription UUID
+            user_id: Owner of the transcription, stored on each chunk
+            chunks: Chunk texts, in order
+            embeddings: One embedding per chunk (numpy rows)
+
+        Returns:
+            Number of chunks inserted
+        """
+
+        if not chunks:
+            return 0
+
+        records = [
+            (transcription_id, user_id, i, chunk_text, embedding)
+            for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings))
+        ]
+
+        # COPY goes through the raw asyncpg connection, halfvec is encoded by
+        # the pgvector codec registered on connect
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "transcription_chunks",
+            records=records,
+            columns=["transcription_id", "user_id", "chunk_index", "text", "embedding"]
+        )
+
+        return len(records)
+
     async def delete_transcription_vectors(self, transcription_id: UUID) -> bool:
         """
         Delete all vector chunks for a transcription.
@@ -229,21 +383,25 @@ class KnowledgeService:
             True if successful
         """
         try:
-            self.db.execute(text("""
+            await self.db.execute(text("""
                 DELETE FROM transcription_chunks
                 WHERE transcription_id = :transcription_id
             """), {"transcription_id": str(transcription_id)})
 
-            self.db.execute(text("""
+            result = await self.db.execute(text("""
                 UPDATE transcriptions
                 SET embedding = NULL
                 WHERE id = :transcription_id
+                RETURNING user_id
             """), {"transcription_id": str(transcription_id)})
+            owner_id = result.scalar()
 
-            self.db.commit()
+            await self.db.commit()
+            if owner_id:
+                await invalidate_kb_stats_cache(owner_id)
             return True
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
     async def get_knowledge_base_stats(self, user_id: UUID) -> Dict[str, Any]:
@@ -257,78 +415,139 @@ class KnowledgeService:
             Dict with statistics
         """
 
+        cached = await cache_get_json(kb_stats_cache_key(user_id))
+        if cached is not None:
+            return cached
+
         # Optimized: Run queries in parallel for better performance
         # Get transcription count and total duration (fast query)
-        transcription_stats = self.db.execute(text("""
+        result = await self.db.execute(text("""
             SELECT
                 COUNT(t.id) as transcription_count,
                 COALESCE(SUM(t.duration_seconds), 0) as total_duration
             FROM transcriptions t
             WHERE t.user_id = :user_id
               AND t.add_to_knowledge_base = true
-        """), {"user_id": str(user_id)}).fetchone()
+        """), {"user_id": str(user_id)})
+        transcription_stats = result.fetchone()
 
         # Get chunk count (separate query, only count chunks)
-        chunk_count = self.db.execute(text("""
-            SELECT COUNT(tc.id)
-            FROM transcription_chunks tc
-            JOIN transcriptions t ON tc.transcription_id = t.id
-            WHERE t.user_id = :user_id
-              AND tc.embedding IS NOT NULL
-        """), {"user_id": str(user_id)}).scalar() or 0
+        chunk_count = await self._count_user_vectors(user_id)
 
         # Get query count
-        query_count = self.db.query(KnowledgeQuery).filter(
-            KnowledgeQuery.user_id == user_id
-        ).count()
+        query_count = await self.db.scalar(
+            select(func.count(KnowledgeQuery.id)).where(KnowledgeQuery.user_id == user_id)
+        )
 
         total_duration_seconds = int(transcription_stats[1]) if transcription_stats[1] else 0
         total_duration_hours = round(total_duration_seconds / 3600, 2)
 
-        return {
+        stats = {
             "transcription_count": transcription_stats[0] or 0,
             "vector_count": chunk_count,
             "query_count": query_count,
             "total_duration_hours": total_duration_hours,
             "collection_name": "pgvector"  # Using pgvector instead of Qdrant collections
         }
+        await cache_set_json(kb_stats_cache_key(user_id), stats, KB_STATS_CACHE_TTL_SECONDS)
+
+        return stats
 
     async def get_query_history(
         self,
         user_id: UUID,
         limit: int = 20,
-        offset: int = 0
-    ) -> List[Dict[str, Any]]:
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
         """
         Get user's query history.
 
+        With a cursor the page is fetched by keyset on (created_at, id), so
+        deep pages cost the same as the first one. Without a cursor the
+        offset is used and the total comes from COUNT(*) OVER() in the same scan.
+
         Args:
             user_id: User's UUID
             limit: Number of results
-            offset: Pagination offset
+            offset: Pagination offset (ignored when cursor is given)
+            cursor: Opaque cursor returned as next_cursor by a previous page
 
         Returns:
-            List of query records
+            Tuple of (query records, total number of queries, next page cursor)
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
 
-        queries = self.db.query(KnowledgeQuery).filter(
-            KnowledgeQuery.user_id == user_id
-        ).order_by(
-            KnowledgeQuery.created_at.desc()
-        ).limit(limit).offset(offset).all()
+        order = (KnowledgeQuery.created_at.desc(), KnowledgeQuery.id.desc())
+
+        # The source list itself is never returned, count it in SQL instead of
+        # shipping the transcription_ids array for every row
+        columns = (
+            KnowledgeQuery.id,
+            KnowledgeQuery.query_text,
+            KnowledgeQuery.response_text,
+            KnowledgeQuery.confidence_score,
+            KnowledgeQuery.response_time_ms,
+            KnowledgeQuery.created_at,
+            func.coalesce(func.cardinality(KnowledgeQuery.transcription_ids), 0).label("source_count")
+        )
 
-        return [
+        if cursor:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            result = await self.db.execute(
+                select(*columns).where(
+                    KnowledgeQuery.user_id == user_id,
+                    tuple_(KnowledgeQuery.created_at, KnowledgeQuery.id) < tuple_(cursor_created_at, cursor_id)
+                ).order_by(*order).limit(limit)
+            )
+            queries = result.all()
+
+            # Index-only count on (user_id, created_at, id)
+            total = await self.db.scalar(
+                select(func.count(KnowledgeQuery.id)).where(KnowledgeQuery.user_id == user_id)
+            )
+        else:
+            result = await self.db.execute(
+                select(
+                    *columns,
+                    func.count().over().label("total")
+                ).where(
+                    KnowledgeQuery.user_id == user_id
+                ).order_by(*order).limit(limit).offset(offset)
+            )
+            queries = result.all()
+
+            if queries:
+                total = queries[0].total
+            elif offset:
+                # Page past the end carries no window row, fall back to a plain count
+                total = await self.db.scalar(
+                    select(func.count(KnowledgeQuery.id)).where(KnowledgeQuery.user_id == user_id)
+                )
+            else:
+                total = 0
+
+        next_cursor = None
+        if len(queries) == limit:
+            next_cursor = encode_cursor(queries[-1].created_at, queries[-1].id)
+
+        records = [
             {
                 "id": str(q.id),
                 "query_text": q.query_text,
                 "response_text": q.response_text,
                 "confidence_score": q.confidence_score,
-                "source_count": len(q.transcription_ids) if q.transcription_ids else 0,
+                "response_time_ms": q.response_time_ms,
+                "source_count": q.source_count,
                 "created_at": q.created_at.isoformat()
             }
             for q in queries
         ]
 
+        return records, total, next_cursor
+
     async def delete_query_history(self, user_id: UUID) -> int:
         """
         Delete all queries for a user.
@@ -340,12 +559,13 @@ class KnowledgeService:
             Number of queries deleted
         """
 
-        count = self.db.query(KnowledgeQuery).filter(
-            KnowledgeQuery.user_id == user_id
-        ).delete()
-        self.db.commit()
+        result = await self.db.execute(
+            delete(KnowledgeQuery).where(KnowledgeQuery.user_id == user_id)
+        )
+        await self.db.commit()
+        await invalidate_kb_stats_cache(user_id)
 
-        return count
+        return result.rowcount
 
     async def clear_knowledge_base(self, user_id: UUID) -> bool:
         """
@@ -359,31 +579,40 @@ class KnowledgeService:
         """
 
         try:
-            # Delete all chunks for user's transcriptions
-            self.db.execute(text("""
-                DELETE FROM transcription_chunks
-                WHERE transcription_id IN (
-                    SELECT id FROM transcriptions WHERE user_id = :user_id
+            # Delete chunks in bounded batches, committing each one
+            while True:
+                result = await self.db.execute(text("""
+                    DELETE FROM transcription_chunks
+                    WHERE id IN (
+                        SELECT id
+                        FROM transcription_chunks
+                        WHERE user_id = :user_id
+                        LIMIT :batch_size
+                    )
+                """), {"user_id": str(user_id), "batch_size": CLEAR_CHUNKS_BATCH_SIZE})
+                await self.db.commit()
+
+                if result.rowcount < CLEAR_CHUNKS_BATCH_SIZE:
+                    break
+
+            # Clear embeddings and query history in one statement
+            await self.db.execute(text("""
+                WITH cleared_embeddings AS (
+                    UPDATE transcriptions
+                    SET embedding = NULL
+                    WHERE user_id = :user_id AND embedding IS NOT NULL
+                    RETURNING id
                 )
-            """), {"user_id": str(user_id)})
-
-            # Clear embeddings from transcriptions
-            self.db.execute(text("""
-                UPDATE transcriptions
-                SET embedding = NULL
+                DELETE FROM knowledge_queries
                 WHERE user_id = :user_id
             """), {"user_id": str(user_id)})
 
-            # Delete query history
-            self.db.query(KnowledgeQuery).filter(
-                KnowledgeQuery.user_id == user_id
-            ).delete()
-
-            self.db.commit()
+            await self.db.commit()
+            await invalidate_kb_stats_cache(user_id)
             return True
 
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
     async def search_similar_transcriptions(
@@ -405,19 +634,20 @@ class KnowledgeService:
         """
 
         # Get embedding of reference transcription
-        result = self.db.execute(text("""
+        result = await self.db.execute(text("""
             SELECT embedding FROM transcriptions
             WHERE id = :transcription_id AND user_id = :user_id
         """), {
             "transcription_id": str(transcription_id),
             "user_id": str(user_id)
-        }).fetchone()
+        })
+        reference = result.fetchone()
 
-        if not result or not result[0]:
+        if not reference or reference[0] is None:
             return []
 
         # Find similar transcriptions
-        results = self.db.execute(text("""
+        result = await self.db.execute(text("""
             SELECT
                 t.id,
                 t.filename,
@@ -439,7 +669,8 @@ class KnowledgeService:
             "transcription_id": str(transcription_id),
             "user_id": str(user_id),
             "limit": limit
-        }).fetchall()
+        })
+        results = result.fetchall()
 
         return [
             {
@@ -455,6 +686,25 @@ class KnowledgeService:
 
     # Private helper methods
 
+    async def _count_user_vectors(self, user_id: UUID) -> int:
+        """
+        Count chunk embeddings belonging to a user.
+
+        Args:
+            user_id: User's UUID
+
+        Returns:
+            Number of chunks with a non-null embedding
+        """
+
+        result = await self.db.execute(text("""
+            SELECT COUNT(id)
+            FROM transcription_chunks
+            WHERE user_id = :user_id
+              AND embedding IS NOT NULL
+        """), {"user_id": str(user_id)})
+        return result.scalar() or 0
+
     def _split_text(self, text: str, chunk_size: int = 1000) -> List[str]:
         """
         Split text into chunks for embedding.
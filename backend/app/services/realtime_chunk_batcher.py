@@ -0,0 +1,195 @@
+"""
+Real-time Chunk Batcher
+Coalesces a user's real-time chunks that arrive within a short window into a
+single Groq request, then splits the transcript back per chunk using word
+timestamps
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from .wav_utils import WAV_FORMAT_PCM, WavInfo, build_wav, parse_wav
+
+logger = logging.getLogger(__name__)
+
+BATCH_WINDOW_MS = 100
+MAX_BATCH_CHUNKS = 4
+
+
+class _PendingChunk:
+    """One submitted chunk waiting for its slice of the batch transcript"""
+
+    def __init__(self, audio_data: bytes, filename: str, context: str, chunk_number: int):
+        self.audio_data = audio_data
+        self.filename = filename
+        self.context = context
+        self.chunk_number = chunk_number
+        self.wav: Optional[WavInfo] = parse_wav(audio_data)
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class RealtimeChunkBatcher:
+    """
+    Per-user micro-batcher for /realtime-stream chunks
+
+    A chunk with nothing else from its user in flight is sent straight away.
+    Otherwise it opens a window of window_ms; chunks arriving before it closes
+    (up to max_batch_size) have their PCM concatenated and are transcribed in
+    one Groq round trip instead of one each.
+    """
+
+    def __init__(
+        self,
+        transcription_service,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch_size: int = MAX_BATCH_CHUNKS
+    ):
+        self.transcription_service = transcription_service
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._open_batches: Dict[str, List[_PendingChunk]] = {}
+        # Chunks per user whose submit() hasn't returned yet
+        self._in_flight: Dict[str, int] = {}
+        # The loop only holds weak references to tasks, keep them alive here
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        user_id: str,
+        audio_data: bytes,
+        filename: str,
+        context: str = "",
+        chunk_number: int = 1
+    ) -> str:
+        """
+        Transcribe a chunk, sharing the Groq call with the user's concurrent chunks
+
+        Returns:
+            Cleaned transcription text for this chunk (empty on failure)
+        """
+        chunk = _PendingChunk(audio_data, filename, context, chunk_number)
+
+        self._in_flight[user_id] = self._in_flight.get(user_id, 0) + 1
+        try:
+            if self._in_flight[user_id] == 1:
+                # Nothing to share a request with, don't wait out the window
+                await self._process([chunk])
+                return await chunk.future
+
+            batch = self._open_batches.get(user_id)
+            if batch is None:
+                batch = self._open_batches[user_id] = []
+                self._spawn(self._flush_after_window(user_id, batch))
+            batch.append(chunk)
+
+            if len(batch) >= self.max_batch_size:
+                self._close(user_id, batch)
+                self._spawn(self._process(batch))
+
+            return await chunk.future
+        finally:
+            self._in_flight[user_id] -= 1
+            if not self._in_flight[user_id]:
+                del self._in_flight[user_id]
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task and hold a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _close(self, user_id: str, batch: List[_PendingChunk]) -> bool:
+        """Stop accepting chunks into batch; False if it was already closed"""
+        if self._open_batches.get(user_id) is batch:
+            del self._open_batches[user_id]
+            return True
+        return False
+
+    async def _flush_after_window(self, user_id: str, batch: List[_PendingChunk]):
+        await asyncio.sleep(self.window)
+        if self._close(user_id, batch):
+            await self._process(batch)
+
+    async def _process(self, batch: List[_PendingChunk]):
+        """Transcribe a closed batch and resolve every chunk's future"""
+        try:
+            if self._can_concatenate(batch):
+                texts = await self._transcribe_concatenated(batch)
+            else:
+                texts = await asyncio.gather(*[
+                    self.transcription_service._transcribe_with_groq_streaming(
+                        chunk.audio_data,
+                        chunk.filename,
+                        context=chunk.context,
+                        chunk_number=chunk.chunk_number
+                    )
+                    for chunk in batch
+                ])
+        except Exception as e:
+            logger.error(f"Batched realtime transcription failed for {len(batch)} chunks: {e}")
+            texts = [""] * len(batch)
+
+        for chunk, text in zip(batch, texts):
+            if not chunk.future.done():
+                chunk.future.set_result(text)
+
+    def _can_concatenate(self, batch: List[_PendingChunk]) -> bool:
+        """Only identical-format PCM WAV chunks can be joined sample-for-sample"""
+        if len(batch) < 2:
+            return False
+
+        first = batch[0].wav
+        if first is None or first.audio_format != WAV_FORMAT_PCM:
+            return False
+
+        return all(
+            chunk.wav is not None
+            and chunk.wav.audio_format == WAV_FORMAT_PCM
+            and chunk.wav.channels == first.channels
+            and chunk.wav.sample_rate == first.sample_rate
+            and chunk.wav.bits_per_sample == first.bits_per_sample
+            for chunk in batch
+        )
+
+    async def _transcribe_concatenated(self, batch: List[_PendingChunk]) -> List[str]:
+        """Send the joined PCM once and assign words back by timestamp"""
+        fmt = batch[0].wav
+        bytes_per_second = fmt.sample_rate * fmt.channels * fmt.bits_per_sample // 8
+
+        pcm_parts = []
+        boundaries = []
+        elapsed = 0.0
+        for chunk in batch:
+            wav = chunk.wav
+            pcm = chunk.audio_data[wav.data_offset:wav.data_offset + wav.data_size]
+            pcm_parts.append(pcm)
+            elapsed += len(pcm) / bytes_per_second
+            boundaries.append(elapsed)
+
+        combined = build_wav(b"".join(pcm_parts), fmt.sample_rate, fmt.channels, fmt.bits_per_sample)
+        prompt = self.transcription_service._build_streaming_prompt(
+            batch[0].context, batch[0].chunk_number
+        )
+        words = await self.transcription_service._transcribe_words_with_groq(
+            combined, "batch.wav", prompt=prompt
+        )
+
+        # A word belongs to the chunk its midpoint falls in
+        chunk_words: List[List[str]] = [[] for _ in batch]
+        for word in words:
+            midpoint = (word["start"] + word["end"]) / 2
+            index = next(
+                (i for i, boundary in enumerate(boundaries) if midpoint < boundary),
+                len(batch) - 1
+            )
+            chunk_words[index].append(word["word"].strip())
+
+        logger.info(f"Batched {len(batch)} realtime chunks into one Groq request")
+
+        return [
+            self.transcription_service._clean_streaming_transcription(
+                " ".join(w for w in texts if w), chunk.context, chunk.chunk_number
+            )
+            for chunk, texts in zip(batch, chunk_words)
+        ]
@@ -4,12 +4,11 @@ Real-time Transcription Service
 Handles streaming audio transcription using Groq Whisper API
 """
 
-import os
-import tempfile
 import asyncio
 import logging
 from typing import Optional
-from groq import Groq
+from groq import AsyncGroq
+from .http_client import get_http_client
 from .rate_limiter import get_groq_rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -29,7 +28,9 @@ class RealtimeTranscriptionService:
             api_key: Groq API key
             buffer_duration: Seconds of audio to buffer before transcribing
         """
-        self.client = Groq(api_key=api_key)
+        # Async client on the shared HTTP pool, so a slow Groq response no longer
+        # blocks the event loop (and every other WebSocket session with it)
+        self.client = AsyncGroq(api_key=api_key, http_client=get_http_client())
         self.rate_limiter = get_groq_rate_limiter()
         self.buffer_duration = buffer_duration
         logger.info(f"Real-time transcription service initialized (buffer: {buffer_duration}s)")
@@ -38,7 +39,8 @@ class RealtimeTranscriptionService:
         self,
         audio_data: bytes,
         language: str = "en",
-        previous_context: Optional[str] = None
+        previous_context: Optional[str] = None,
+        filename: str = "chunk.webm"
     ) -> dict:
         """
         Transcribe a single audio chunk
@@ -47,6 +49,7 @@ class RealtimeTranscriptionService:
             audio_data: Raw audio bytes (WebM format from browser)
             language: Language code
             previous_context: Previous transcript for context (improves accuracy)
+            filename: Upload name, Groq infers the container format from its extension
 
         Returns:
             dict: {
@@ -59,60 +62,49 @@ class RealtimeTranscriptionService:
 
         async def _transcribe():
             """Inner function for actual transcription"""
-            temp_file = None
             try:
-                # Save audio chunk to temporary file
-                temp_file = tempfile.NamedTemporaryFile(
-                    suffix='.webm',
-                    delete=False
+                # Transcribe with Groq Whisper, uploading the chunk straight from memory
+                # Use whisper-large-v3-turbo for faster real-time processing
+                # Note: Groq's API doesn't support streaming, so we process chunks
+                transcript_response = await self.client.audio.transcriptions.create(
+                    file=(filename, audio_data),
+                    model="whisper-large-v3-turbo",
+                    language=language if language != "auto" else None,
+                    response_format="verbose_json",  # Get detailed response
+                    temperature=0.0  # More deterministic for real-time
                 )
-                temp_file.write(audio_data)
-                temp_file.flush()
-                temp_file.close()
-
-                # Transcribe with Groq Whisper
-                with open(temp_file.name, 'rb') as audio_file:
-                    # Use whisper-large-v3-turbo for faster real-time processing
-                    # Note: Groq's API doesn't support streaming, so we process chunks
-                    transcript_response = self.client.audio.transcriptions.create(
-                        file=audio_file,
-                        model="whisper-large-v3-turbo",
-                        language=language if language != "auto" else None,
-                        response_format="verbose_json",  # Get detailed response
-                        temperature=0.0  # More deterministic for real-time
-                    )
-
-                    # Extract text
-                    text = ""
-                    if hasattr(transcript_response, 'text'):
-                        text = transcript_response.text
-                    else:
-                        text = str(transcript_response)
-
-                    # Calculate confidence (if available)
-                    confidence = 1.0
-                    if hasattr(transcript_response, 'segments') and transcript_response.segments:
-                        # Average confidence from segments
-                        confidences = [
-                            seg.get('avg_logprob', 0)
-                            for seg in transcript_response.segments
-                        ]
-                        if confidences:
-                            # Convert log probability to confidence (rough approximation)
-                            avg_logprob = sum(confidences) / len(confidences)
-                            confidence = min(1.0, max(0.0, (avg_logprob + 1.0)))
-
-                    # Detect language
-                    detected_language = language
-                    if hasattr(transcript_response, 'language'):
-                        detected_language = transcript_response.language
 
-                    return {
-                        "text": text.strip(),
-                        "is_final": True,  # Each chunk is final
-                        "confidence": confidence,
-                        "language": detected_language
-                    }
+                # Extract text
+                text = ""
+                if hasattr(transcript_response, 'text'):
+                    text = transcript_response.text
+                else:
+                    text = str(transcript_response)
+
+                # Calculate confidence (if available)
+                confidence = 1.0
+                if hasattr(transcript_response, 'segments') and transcript_response.segments:
+                    # Average confidence from segments
+                    confidences = [
+                        seg.get('avg_logprob', 0)
+                        for seg in transcript_response.segments
+                    ]
+                    if confidences:
+                        # Convert log probability to confidence (rough approximation)
+                        avg_logprob = sum(confidences) / len(confidences)
+                        confidence = min(1.0, max(0.0, (avg_logprob + 1.0)))
+
+                # Detect language
+                detected_language = language
+                if hasattr(transcript_response, 'language'):
+                    detected_language = transcript_response.language
+
+                return {
+                    "text": text.strip(),
+                    "is_final": True,  # Each chunk is final
+                    "confidence": confidence,
+                    "language": detected_language
+                }
 
             except Exception as e:
                 error_msg = str(e).lower()
@@ -142,14 +134,6 @@ class RealtimeTranscriptionService:
                     "error": str(e)
                 }
 
-            finally:
-                # Clean up temporary file
-                if temp_file and os.path.exists(temp_file.name):
-                    try:
-                        os.unlink(temp_file.name)
-                    except:
-                        pass
-
         # Execute with rate limiting
         try:
             result = await self.rate_limiter.execute_with_retry(_transcribe)
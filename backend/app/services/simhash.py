@@ -0,0 +1,48 @@
+"""
+SimHash Fingerprints
+64-bit locality-sensitive fingerprints for cheap near-duplicate text detection
+"""
+import hashlib
+from typing import List
+
+FINGERPRINT_BITS = 64
+
+
+def _shingle_hash(shingle: str) -> int:
+    """64-bit hash of one shingle"""
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+
+
+def simhash(words: List[str], shingle_size: int = 3) -> int:
+    """
+    Fingerprint a word sequence from its overlapping word shingles
+
+    Near-identical texts produce fingerprints a few bits apart.
+
+    Args:
+        words: Tokens, already normalized (e.g. lowercased)
+        shingle_size: Words per shingle
+
+    Returns:
+        64-bit fingerprint (0 for empty input)
+    """
+    if not words:
+        return 0
+
+    size = min(shingle_size, len(words))
+    weights = [0] * FINGERPRINT_BITS
+    for i in range(len(words) - size + 1):
+        h = _shingle_hash(" ".join(words[i:i + size]))
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return (a ^ b).bit_count()
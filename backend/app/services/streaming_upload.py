@@ -0,0 +1,159 @@
+"""
+Streaming Upload
+Parses a multipart/form-data body straight off request.stream() and hands the
+file part to a storage writer, so uploads never land in a spooled temp file
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Coalesce parser output into writes of this size before leaving the event loop
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Non-file form fields are small (title, language, flags)
+MAX_FIELD_SIZE = 64 * 1024
+
+
+@dataclass
+class StreamedUpload:
+    """Result of a streamed multipart upload"""
+    fields: Dict[str, str] = field(default_factory=dict)
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    size: int = 0
+    file_url: Optional[str] = None
+
+
+async def stream_multipart_upload(
+    request: Request,
+    open_writer: Callable[[str, str], Any],
+    max_file_size: int
+) -> StreamedUpload:
+    """
+    Read a multipart request body chunk by chunk
+
+    Args:
+        request: Incoming request with a multipart/form-data body
+        open_writer: Called with (filename, content_type) when the file part
+            starts; returns a writer with write/complete/abort
+        max_file_size: Abort once the file part grows past this many bytes
+
+    Returns:
+        Text fields plus the stored file's name, type, size and URL
+
+    Raises:
+        ValueError: If the body is not multipart, has more than one file,
+            or the file is too large
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise ValueError("Expected a multipart/form-data body")
+
+    # Parser callbacks are synchronous, so they only record events; the
+    # awaiting (thread hops for storage writes) happens between feeds
+    events = []
+    headers: Dict[bytes, bytes] = {}
+    header_field = bytearray()
+    header_value = bytearray()
+
+    def on_header_field(data, start, end):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        events.append(("headers", dict(headers)))
+        headers.clear()
+
+    def on_part_data(data, start, end):
+        events.append(("data", data[start:end]))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(boundary, {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    result = StreamedUpload()
+    writer = None
+    buffer = bytearray()
+    part_name: Optional[str] = None
+    part_is_file = False
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+
+            for kind, value in events:
+                if kind == "headers":
+                    _, options = parse_options_header(value.get(b"content-disposition", b""))
+                    part_name = options.get(b"name", b"").decode("latin-1")
+                    filename = options.get(b"filename")
+                    part_is_file = filename is not None
+
+                    if part_is_file:
+                        if writer is not None:
+                            raise ValueError("Only one file may be uploaded per request")
+                        result.filename = filename.decode("utf-8", "replace")
+                        result.content_type = value.get(
+                            b"content-type", b"application/octet-stream"
+                        ).decode("latin-1")
+                        writer = await asyncio.to_thread(
+                            open_writer, result.filename, result.content_type
+                        )
+
+                elif kind == "data":
+                    buffer.extend(value)
+                    if part_is_file:
+                        result.size += len(value)
+                        if result.size > max_file_size:
+                            raise ValueError(
+                                f"File too large. Maximum size: {max_file_size / 1024 / 1024:.1f}MB"
+                            )
+                        if len(buffer) >= WRITE_BUFFER_SIZE:
+                            await asyncio.to_thread(writer.write, bytes(buffer))
+                            buffer.clear()
+                    elif len(buffer) > MAX_FIELD_SIZE:
+                        raise ValueError(f"Form field too large: {part_name}")
+
+                elif kind == "end":
+                    if part_is_file:
+                        if buffer:
+                            await asyncio.to_thread(writer.write, bytes(buffer))
+                    else:
+                        result.fields[part_name] = buffer.decode("utf-8", "replace")
+                    buffer.clear()
+
+            events.clear()
+
+        parser.finalize()
+
+        if writer is not None:
+            result.file_url = await asyncio.to_thread(writer.complete)
+
+    except BaseException:
+        if writer is not None and result.file_url is None:
+            await asyncio.to_thread(writer.abort)
+        raise
+
+    logger.info(f"Streamed upload {result.filename}: {result.size} bytes")
+    return result
@@ -8,6 +8,7 @@ import math
 from typing import Optional, List, Tuple, Dict, Any
 from groq import Groq
 from sentence_transformers import SentenceTransformer
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
@@ -15,16 +16,46 @@ import tempfile
 import shutil
 import re
 import asyncio
-from fastapi import UploadFile
+import contextlib
+import hashlib
+from pathlib import Path
+from cachetools import TTLCache
 
 from ..config import settings
+from ..database import AsyncSessionLocal
 from ..models import Transcription, User
 from .file_service import FileService
 from .rate_limiter import get_groq_rate_limiter
+from .http_client import get_async_groq_client
+from .wav_utils import is_ready_wav, wav_file_duration
 from .diarization_service import get_diarization_service
 
 logger = logging.getLogger(__name__)
 
+# Concurrent ffmpeg/ffprobe processes per worker, leaving a core for the event loop.
+# Each conversion runs single-threaded so bursts can't oversubscribe the CPU
+FFMPEG_MAX_CONCURRENCY = max(1, (os.cpu_count() or 2) - 1)
+_ffmpeg_slots = asyncio.Semaphore(FFMPEG_MAX_CONCURRENCY)
+
+# In-flight real-time Groq requests per worker, so one client's burst of
+# chunks can't monopolize the connection pool and API quota
+GROQ_MAX_CONCURRENCY = 32
+_groq_slots = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+
+# Raw Groq text for recently transcribed real-time chunks, keyed by every
+# request input (model, language, prompt and SHA-256 of the audio), so client
+# retries/replays don't pay for a second call
+groq_response_cache = TTLCache(maxsize=5000, ttl=300)
+
+
+def _groq_cache_key(model: str, audio_data: bytes, language: Optional[str], prompt: Optional[str]) -> str:
+    digest = hashlib.sha256(audio_data)
+    # Length-prefixed so no two (language, prompt) pairs hash the same
+    for part in (language or "", prompt or ""):
+        encoded = part.encode()
+        digest.update(len(encoded).to_bytes(8, "big") + encoded)
+    return f"{model}:{digest.hexdigest()}"
+
 
 class TranscriptionService:
     def __init__(self):
@@ -34,12 +65,15 @@ class TranscriptionService:
         # Initialize Groq client with rate limiting
         try:
             self.groq_client = Groq(api_key=settings.GROQ_API_KEY)
+            # Async client on the shared HTTP/2 pool for latency-sensitive real-time calls
+            self.async_groq_client = get_async_groq_client()
             self.rate_limiter = get_groq_rate_limiter()
             logger.info("✅ Groq client initialized with rate limiting")
             self.groq_available = True
         except Exception as e:
             logger.error(f"❌ Groq initialization failed: {e}")
             self.groq_client = None
+            self.async_groq_client = None
             self.groq_available = False
 
         # Initialize diarization service
@@ -372,8 +406,8 @@ class TranscriptionService:
                 raise RuntimeError(f"Audio conversion failed: {result.stderr}")
             
             # Remove original file to save space
-            if os.path.exists(input_path) and input_path != wav_path:
-                os.remove(input_path)
+            if input_path != wav_path:
+                Path(input_path).unlink(missing_ok=True)
                 
             file_size = os.path.getsize(wav_path)
             logger.info(f"Converted to WAV: {file_size / (1024*1024):.1f} MB")
@@ -463,8 +497,8 @@ class TranscriptionService:
                         transcriptions.append(f"[Segment {i+1}] {chunk_transcription}")
                     
                     # Clean up chunk file
-                    if os.path.exists(chunk_path) and chunk_path != audio_path:
-                        os.remove(chunk_path)
+                    if chunk_path != audio_path:
+                        Path(chunk_path).unlink(missing_ok=True)
                         
                 except Exception as e:
                     logger.error(f"Failed to transcribe chunk {i+1}: {e}")
@@ -639,8 +673,7 @@ class TranscriptionService:
             converted_path = await self._convert_to_wav_safe(temp_path, wav_path)
             
             # Clean up original
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            Path(temp_path).unlink(missing_ok=True)
             
             return converted_path
             
@@ -806,6 +839,89 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             logger.error(f"Summary generation failed: {e}")
             return "Summary generation failed"
 
+    async def _run_command(
+        self,
+        cmd: List[str],
+        timeout: float,
+        cwd: Optional[str] = None,
+        input_data: Optional[bytes] = None
+    ) -> Tuple[int, bytes, bytes]:
+        """
+        Run an external command without blocking the event loop, at most
+        FFMPEG_MAX_CONCURRENCY at a time per worker
+
+        Args:
+            cmd: Command and arguments
+            timeout: Seconds before the process is killed
+            cwd: Optional working directory
+            input_data: Optional bytes piped to the process's stdin
+
+        Returns:
+            Tuple of (return code, stdout, stderr)
+
+        Raises:
+            asyncio.TimeoutError: If the process does not finish in time
+        """
+        async with _ffmpeg_slots:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE if input_data is not None else None,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                limit=1 << 20
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(input_data), timeout=timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+
+        return proc.returncode, stdout, stderr
+
+    async def _convert_bytes_to_wav(self, audio_data: bytes, filename: str = "chunk.webm") -> Tuple[bytes, str]:
+        """
+        Convert an in-memory real-time chunk to 16kHz mono WAV through ffmpeg pipes
+
+        Args:
+            audio_data: Raw chunk bytes (usually WebM from the browser)
+            filename: Original filename, used for the input format hint
+
+        Returns:
+            Tuple of (audio bytes, filename to upload them as). Falls back to the
+            original bytes when ffmpeg can't decode the chunk (Groq accepts WebM).
+        """
+        # Already in the target format (sniffed from the header, not the extension)
+        if is_ready_wav(audio_data):
+            return audio_data, f"{os.path.splitext(filename)[0]}.wav"
+
+        is_webm = filename.lower().endswith('.webm')
+        cmd = [
+            "ffmpeg", "-hide_banner", "-v", "error", "-threads", "1",
+            *(["-f", "webm"] if is_webm else []),
+            "-i", "pipe:0",
+            "-vn",
+            "-ar", "16000",
+            "-ac", "1",
+            "-acodec", "pcm_s16le",
+            "-f", "wav",
+            "pipe:1"
+        ]
+
+        try:
+            returncode, stdout, stderr = await self._run_command(cmd, timeout=60, input_data=audio_data)
+        except asyncio.TimeoutError:
+            logger.error("FFmpeg pipe conversion timed out")
+            raise RuntimeError("Audio conversion timed out")
+
+        if returncode == 0 and stdout:
+            logger.info(f"Conversion successful: {len(audio_data)} → {len(stdout)} bytes")
+            return stdout, f"{os.path.splitext(filename)[0]}.wav"
+
+        logger.warning(f"Pipe conversion failed, using original chunk: {stderr.decode(errors='ignore').strip()}")
+        return audio_data, filename
+
     async def _convert_to_wav(self, audio_path: str) -> str:
         """
         Enhanced audio conversion with WebM support for real-time chunks
@@ -832,7 +948,7 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             if audio_path.lower().endswith('.webm'):
                 # Special handling for WebM real-time chunks
                 cmd = [
-                    "ffmpeg", "-y", "-v", "error",  # Suppress verbose output
+                    "ffmpeg", "-y", "-v", "error", "-threads", "1",  # Suppress verbose output
                     "-f", "webm",  # Force WebM input format
                     "-i", audio_path,
                     "-vn",  # No video
@@ -845,7 +961,7 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             else:
                 # Standard conversion for other formats
                 cmd = [
-                    "ffmpeg", "-y", "-v", "error",
+                    "ffmpeg", "-y", "-v", "error", "-threads", "1",
                     "-i", audio_path,
                     "-vn",
                     "-ar", "16000",
@@ -857,15 +973,13 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             logger.info(f"Running FFmpeg: {' '.join(cmd)}")
             
             # Run conversion with timeout
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
+            returncode, _, _ = await self._run_command(
+                cmd,
                 timeout=60,
                 cwd=os.path.dirname(audio_path) if os.path.dirname(audio_path) else None
             )
             
-            if result.returncode == 0 and os.path.exists(wav_path):
+            if returncode == 0 and os.path.exists(wav_path):
                 output_size = os.path.getsize(wav_path)
                 logger.info(f"Conversion successful: {file_size} → {output_size} bytes")
                 return wav_path
@@ -874,7 +988,7 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
                 logger.warning(f"Standard conversion failed, trying alternative method")
                 return await self._convert_webm_alternative(audio_path)
                 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error("FFmpeg conversion timed out")
             raise RuntimeError("Audio conversion timed out")
         except Exception as e:
@@ -891,7 +1005,7 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             
             # Try with different WebM handling
             cmd = [
-                "ffmpeg", "-y", "-v", "error",
+                "ffmpeg", "-y", "-v", "error", "-threads", "1",
                 "-fflags", "+genpts",  # Generate presentation timestamps
                 "-avoid_negative_ts", "make_zero",  # Handle timing issues
                 "-i", audio_path,
@@ -903,9 +1017,9 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
                 wav_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            returncode, _, _ = await self._run_command(cmd, timeout=30)
             
-            if result.returncode == 0 and os.path.exists(wav_path):
+            if returncode == 0 and os.path.exists(wav_path):
                 logger.info("Alternative WebM conversion successful")
                 return wav_path
             else:
@@ -1005,15 +1119,17 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
         try:
             from .knowledge_service import KnowledgeService
 
-            knowledge_service = KnowledgeService(db)
+            # KnowledgeService runs on the async engine, use its own session
+            async with AsyncSessionLocal() as kb_db:
+                knowledge_service = KnowledgeService(kb_db)
 
-            # Store the transcription with chunks
-            await knowledge_service.store_transcription(
-                transcription_id=transcription_id,
-                text=transcription,
-                user_id=user_id,
-                summary=summary
-            )
+                # Store the transcription with chunks
+                await knowledge_service.store_transcription(
+                    transcription_id=transcription_id,
+                    content=transcription,
+                    user_id=user_id,
+                    summary=summary
+                )
 
             logger.info(f"Successfully stored transcription in pgvector knowledge base")
             return True
@@ -1027,8 +1143,9 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
         try:
             from .knowledge_service import KnowledgeService
 
-            knowledge_service = KnowledgeService(db)
-            await knowledge_service.delete_transcription(transcription_id)
+            async with AsyncSessionLocal() as kb_db:
+                knowledge_service = KnowledgeService(kb_db)
+                await knowledge_service.delete_transcription_vectors(transcription_id)
 
             logger.info(f"Deleted transcription {transcription_id} from knowledge base")
             return True
@@ -1257,7 +1374,8 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
     
     async def _transcribe_with_groq_streaming(
         self, 
-        audio_path: str, 
+        audio_data: bytes,
+        filename: str,
         language: str = "auto",
         context: str = "",
         chunk_number: int = 1
@@ -1266,7 +1384,7 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
         Enhanced transcription for real-time streaming with context awareness
         """
         try:
-            file_size = os.path.getsize(audio_path)
+            file_size = len(audio_data)
             logger.info(f"Transcribing streaming chunk {chunk_number}: {file_size/(1024):.1f}KB")
             
             # Skip very small files
@@ -1276,44 +1394,85 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             # Ensure file is not too large for streaming
             if file_size > self.MAX_FILE_SIZE:
                 # Try to compress for streaming
-                compressed_path = await self._compress_audio_for_streaming(audio_path)
-                if os.path.getsize(compressed_path) <= self.MAX_FILE_SIZE:
-                    audio_path = compressed_path
+                compressed = await self._compress_audio_for_streaming(audio_data)
+                if len(compressed) <= self.MAX_FILE_SIZE:
+                    audio_data = compressed
                 else:
                     logger.warning(f"Streaming chunk too large: {file_size/(1024*1024):.1f}MB")
                     return ""
             
-            # Enhanced transcription with streaming optimizations
-            with open(audio_path, "rb") as audio_file:
-                # Build prompt for better context continuity
-                prompt = self._build_streaming_prompt(context, chunk_number)
-                
-                # Use Groq Whisper with streaming-optimized parameters
-                response = self.groq_client.audio.transcriptions.create(
-                    file=audio_file,
-                    model="whisper-large-v3",
-                    language=language if language != "auto" else None,
-                    prompt=prompt,
-                    response_format="text",
-                    temperature=0.1,  # Lower temperature for more consistent results
-                )
-                
-                # Clean and filter the transcription
-                transcription = self._clean_streaming_transcription(
-                    response.strip(), 
-                    context,
-                    chunk_number
-                )
-                
-                if transcription:
-                    logger.info(f"Streaming transcription {chunk_number}: {len(transcription)} chars")
-                
-                return transcription
+            # Build prompt for better context continuity
+            prompt = self._build_streaming_prompt(context, chunk_number)
+            
+            groq_language = language if language != "auto" else None
+            cache_key = _groq_cache_key("whisper-large-v3", audio_data, groq_language, prompt)
+            response = groq_response_cache.get(cache_key)
+            if response is None:
+                # Use Groq Whisper with streaming-optimized parameters, uploading
+                # straight from memory over the shared connection pool
+                async with _groq_slots:
+                    response = await self.async_groq_client.audio.transcriptions.create(
+                        file=(filename, audio_data),
+                        model="whisper-large-v3",
+                        language=groq_language,
+                        prompt=prompt,
+                        response_format="text",
+                        temperature=0.1,  # Lower temperature for more consistent results
+                    )
+                groq_response_cache[cache_key] = response
+            
+            # Clean and filter the transcription
+            transcription = self._clean_streaming_transcription(
+                response.strip(), 
+                context,
+                chunk_number
+            )
+            
+            if transcription:
+                logger.info(f"Streaming transcription {chunk_number}: {len(transcription)} chars")
+            
+            return transcription
                 
         except Exception as e:
             logger.error(f"Streaming transcription failed for chunk {chunk_number}: {e}")
             return ""
 
+    async def _transcribe_words_with_groq(
+        self,
+        audio_data: bytes,
+        filename: str,
+        prompt: Optional[str] = None,
+        language: str = "auto"
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcribe in-memory audio and return word-level timestamps
+
+        Args:
+            audio_data: Audio bytes
+            filename: Filename to upload the bytes as
+            prompt: Optional context prompt
+            language: Language code or "auto"
+
+        Returns:
+            List of {"word", "start", "end"} dicts, times in seconds
+        """
+        async with _groq_slots:
+            response = await self.async_groq_client.audio.transcriptions.create(
+                file=(filename, audio_data),
+                model="whisper-large-v3",
+                language=language if language != "auto" else None,
+                prompt=prompt,
+                response_format="verbose_json",
+                timestamp_granularities=["word"],
+                temperature=0.1,
+            )
+
+        words = getattr(response, "words", None) or []
+        return [
+            word if isinstance(word, dict) else {"word": word.word, "start": word.start, "end": word.end}
+            for word in words
+        ]
+
     def _build_streaming_prompt(self, context: str, chunk_number: int) -> str:
         """
         Build context-aware prompt for better transcription continuity
@@ -1389,59 +1548,57 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
         
         return cleaned
 
-    async def _compress_audio_for_streaming(self, audio_path: str) -> str:
+    async def _compress_audio_for_streaming(self, audio_data: bytes) -> bytes:
         """
         Compress audio specifically for streaming transcription
         """
         try:
-            base_path = os.path.splitext(audio_path)[0]
-            compressed_path = f"{base_path}_stream_compressed.wav"
-            
             # More aggressive compression for streaming
             cmd = [
-                "ffmpeg", "-y",
-                "-i", audio_path,
+                "ffmpeg", "-hide_banner", "-v", "error", "-threads", "1",
+                "-i", "pipe:0",
                 "-ar", "8000",  # Lower sample rate for streaming
                 "-ac", "1",     # Mono
                 "-ab", "32k",   # Lower bitrate
                 "-f", "wav",
-                compressed_path
+                "pipe:1"
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            returncode, stdout, _ = await self._run_command(cmd, timeout=30, input_data=audio_data)
             
-            if result.returncode == 0 and os.path.exists(compressed_path):
-                new_size = os.path.getsize(compressed_path)
-                original_size = os.path.getsize(audio_path)
-                
-                logger.info(f"Compressed streaming audio: {original_size/(1024):.1f}KB → {new_size/(1024):.1f}KB")
-                return compressed_path
+            if returncode == 0 and stdout:
+                logger.info(f"Compressed streaming audio: {len(audio_data)/(1024):.1f}KB → {len(stdout)/(1024):.1f}KB")
+                return stdout
             else:
                 logger.warning("Streaming compression failed, using original")
-                return audio_path
+                return audio_data
                 
         except Exception as e:
             logger.error(f"Streaming compression error: {e}")
-            return audio_path
+            return audio_data
 
     async def process_complete_realtime_recording(
         self, 
         transcription: Transcription, 
-        audio_file: UploadFile,
+        temp_path: str,
         db: Session
     ) -> Dict[str, Any]:
         """
         Process complete real-time recording with enhanced final transcription
+
+        Args:
+            transcription: Transcription record to fill in
+            temp_path: Recording already streamed to disk by the caller
+            db: Database session
         """
+        # Intermediate files are registered for removal as soon as they exist,
+        # the caller owns temp_path
+        cleanup = contextlib.ExitStack()
         try:
-            # Save audio file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_file:
-                content = await audio_file.read()
-                temp_file.write(content)
-                temp_path = temp_file.name
-
             # Convert to WAV
             wav_path = await self._convert_to_wav(temp_path)
+            if wav_path != temp_path:
+                cleanup.callback(Path(wav_path).unlink, missing_ok=True)
             
             # Get duration
             duration = await self._get_audio_duration(wav_path)
@@ -1494,18 +1651,15 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             transcription.status = "completed"
             transcription.completed_at = datetime.utcnow()
             
-            # Update user usage
-            user = db.query(User).filter(User.id == transcription.user_id).first()
-            if user:
-                user.monthly_transcription_count += 1
+            # Update user usage in SQL so concurrent completes can't lose an increment
+            db.execute(
+                update(User)
+                .where(User.id == transcription.user_id)
+                .values(monthly_transcription_count=User.monthly_transcription_count + 1)
+            )
             
             db.commit()
             
-            # Clean up temporary files
-            for path in [temp_path, wav_path]:
-                if os.path.exists(path):
-                    os.remove(path)
-            
             logger.info(f"Real-time recording processed successfully: {transcription.id}")
             
             return {
@@ -1526,21 +1680,28 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
             transcription.error_message = str(e)
             db.commit()
             raise RuntimeError(f"Processing failed: {str(e)}")
+        finally:
+            cleanup.close()
 
     async def _get_audio_duration(self, audio_path: str) -> float:
         """
-        Get audio duration using ffprobe
+        Get audio duration, from the RIFF header for PCM WAVs and ffprobe otherwise
         """
         try:
+            # Our own conversions are 16kHz mono PCM; no need to spawn ffprobe
+            duration = wav_file_duration(audio_path)
+            if duration is not None:
+                return duration
+
             cmd = [
                 "ffprobe", "-v", "quiet", "-show_entries", "format=duration",
                 "-of", "csv=p=0", audio_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            returncode, stdout, _ = await self._run_command(cmd, timeout=30)
             
-            if result.returncode == 0:
-                duration = float(result.stdout.strip())
+            if returncode == 0:
+                duration = float(stdout.decode().strip())
                 return duration
             else:
                 logger.warning("Could not determine audio duration")
@@ -1549,17 +1710,17 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
         except Exception as e:
             logger.error(f"Duration detection failed: {e}")
             return 0.0
-    async def _transcribe_live_chunk(self, audio_path: str) -> str:
+    async def _transcribe_live_chunk(self, audio_data: bytes, filename: str = "chunk.webm") -> str:
         """
         Transcribe live audio chunks (for real-time recording)
         Uses transcriptions API (faster, works with small WebM files)
         Returns text in original language - translation happens on final complete
         """
         try:
-            logger.info(f"Transcribing live chunk: {audio_path}")
+            logger.info(f"Transcribing live chunk: {filename}")
 
             # Check file size
-            file_size = os.path.getsize(audio_path)
+            file_size = len(audio_data)
 
             # Skip very small files (less than 10KB)
             if file_size < 10240:
@@ -1567,14 +1728,20 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
                 return ""
 
             # Determine file type
-            file_ext = os.path.splitext(audio_path)[1].lower()
+            file_ext = os.path.splitext(filename)[1].lower()
             logger.info(f"Processing live {file_ext} chunk of size {file_size} bytes")
 
+            cache_key = _groq_cache_key("whisper-large-v3-turbo", audio_data, "en", None)
+            cached = groq_response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             async def _do_transcription():
-                with open(audio_path, "rb") as audio_file:
-                    # Use transcriptions API for live chunks (works better with WebM)
-                    response = self.groq_client.audio.transcriptions.create(
-                        file=audio_file,
+                # Use transcriptions API for live chunks (works better with WebM),
+                # the bytes are uploaded from memory without a temp file
+                async with _groq_slots:
+                    response = await self.async_groq_client.audio.transcriptions.create(
+                        file=(filename, audio_data),
                         model="whisper-large-v3-turbo",  # Turbo for speed
                         response_format="text",
                         temperature=0.0,
@@ -1591,7 +1758,9 @@ Keep the summary concise yet comprehensive. Focus on what matters most."""
                 return transcription
 
             # Execute with rate limiting
-            return await self.rate_limiter.execute_with_retry(_do_transcription)
+            transcription = await self.rate_limiter.execute_with_retry(_do_transcription)
+            groq_response_cache[cache_key] = transcription
+            return transcription
 
         except Exception as e:
             logger.error(f"Live chunk transcription failed: {e}")
@@ -0,0 +1,138 @@
+"""
+WAV Utilities
+Minimal RIFF/WAVE header parsing and building for in-memory PCM audio
+"""
+import os
+import struct
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+# WAVE_FORMAT_PCM in the fmt chunk
+WAV_FORMAT_PCM = 1
+
+
+class WavInfo(NamedTuple):
+    """Format and PCM payload location of a WAV buffer"""
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data_offset: int
+    data_size: int
+
+
+def parse_wav(buf: bytes) -> Optional[WavInfo]:
+    """
+    Parse the RIFF header of a WAV buffer
+
+    Walks the chunk list for "fmt " and "data". Streamed WAVs (e.g. ffmpeg
+    writing to a pipe) carry placeholder sizes, so the data size is clamped
+    to the bytes actually present.
+
+    Returns:
+        WavInfo, or None if the buffer is not a RIFF/WAVE file
+    """
+    if len(buf) < 12:
+        return None
+
+    riff, _, wave = struct.unpack_from("<4sI4s", buf, 0)
+    if riff != b"RIFF" or wave != b"WAVE":
+        return None
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(buf):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", buf, offset)
+        body = offset + 8
+
+        if chunk_id == b"fmt " and body + 16 <= len(buf):
+            fmt = struct.unpack_from("<HHIIHH", buf, body)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            audio_format, channels, sample_rate, _, _, bits_per_sample = fmt
+            return WavInfo(
+                audio_format=audio_format,
+                channels=channels,
+                sample_rate=sample_rate,
+                bits_per_sample=bits_per_sample,
+                data_offset=body,
+                data_size=min(chunk_size, len(buf) - body)
+            )
+
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def is_ready_wav(buf: bytes, sample_rate: int = 16000) -> bool:
+    """True if buf is already 16-bit PCM mono WAV at sample_rate (no transcode needed)"""
+    info = parse_wav(buf)
+    return (
+        info is not None
+        and info.audio_format == WAV_FORMAT_PCM
+        and info.channels == 1
+        and info.sample_rate == sample_rate
+        and info.bits_per_sample == 16
+    )
+
+
+def wav_file_duration(path: str, head_size: int = 4096) -> Optional[float]:
+    """
+    Duration of a PCM WAV file computed from its header and file size
+
+    The data size is taken from the file size rather than the header, since
+    WAVs written through a pipe carry placeholder sizes.
+
+    Returns:
+        Duration in seconds, or None if the file is not PCM WAV
+    """
+    with open(path, "rb") as f:
+        head = f.read(head_size)
+        file_size = os.fstat(f.fileno()).st_size
+
+    info = parse_wav(head)
+    if info is None or info.audio_format != WAV_FORMAT_PCM:
+        return None
+
+    bytes_per_second = info.sample_rate * info.channels * info.bits_per_sample // 8
+    if bytes_per_second == 0:
+        return None
+
+    return max(file_size - info.data_offset, 0) / bytes_per_second
+
+
+def build_wav(pcm: bytes, sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Wrap raw little-endian PCM samples in a canonical 44-byte WAV header"""
+    block_align = channels * bits_per_sample // 8
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, WAV_FORMAT_PCM, channels, sample_rate,
+        sample_rate * block_align, block_align, bits_per_sample,
+        b"data", len(pcm)
+    )
+    return header + pcm
+
+
+def pcm16_rms(buf: bytes) -> Optional[float]:
+    """
+    Root-mean-square level of a 16-bit PCM WAV, normalized to 0..1
+
+    Returns:
+        RMS level, or None if buf is not 16-bit PCM WAV
+    """
+    info = parse_wav(buf)
+    if info is None or info.audio_format != WAV_FORMAT_PCM or info.bits_per_sample != 16:
+        return None
+
+    data_size = info.data_size - (info.data_size & 1)
+    samples = np.frombuffer(buf, dtype="<i2", count=data_size // 2, offset=info.data_offset)
+    if samples.size == 0:
+        return 0.0
+
+    samples = samples.astype(np.float32) * (1 / 32768.0)
+    return float(np.sqrt(np.dot(samples, samples) / samples.size))
@@ -0,0 +1,45 @@
+# backend/app/tasks.py
+"""
+Celery Tasks
+Thin wrappers that run the async processing pipeline inside a worker process
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from .celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+# One event loop per worker process. The shared async clients (Groq/httpx pool,
+# asyncpg engine) bind to the loop they first run on, so a fresh asyncio.run()
+# per task would leave them attached to a closed loop
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _run(coro):
+    """Run a coroutine on this worker process's event loop"""
+    global _worker_loop
+
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+
+    return _worker_loop.run_until_complete(coro)
+
+
+@celery_app.task(name="process_transcription")
+def process_transcription(transcription_id: str, processing_type: str, payload: str):
+    """
+    Process a transcription created by the API
+
+    Args:
+        transcription_id: Transcription ID
+        processing_type: "file", "url" or "text"
+        payload: Storage URL, media URL or raw text, matching processing_type
+    """
+    # Imported here: the routes module imports this one to enqueue jobs
+    from .routes.transcriptions import process_transcription_background
+
+    _run(process_transcription_background(transcription_id, processing_type, payload))